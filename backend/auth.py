@@ -1,19 +1,40 @@
 import os
 import jwt
+import time
+import asyncio
+import hashlib
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, Tuple
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorClient
-from models import User
+from models import USER_PROJECTION, User
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, so it runs in a thread pool (the C code
+# releases the GIL) instead of on the event loop. Jobs beyond the queue
+# limit are rejected so a login burst cannot pile up work.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", "32"))  # running + waiting jobs
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending_password_jobs = 0
+
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+# Access tokens are short-lived and checked without a database lookup;
+# refresh tokens renew them and are revocable per session
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# Tabs sharing a refresh token may present it together; the one that loses
+# the race within this window is not treated as a replay
+REFRESH_REUSE_GRACE_SECONDS = float(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "30"))
 
 # Security scheme
 security = HTTPBearer()
@@ -26,6 +47,27 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
+async def run_password_job(func, *args):
+    """Run a password hash/verify function in the password thread pool."""
+    global _pending_password_jobs
+    if _pending_password_jobs >= PASSWORD_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    
+    _pending_password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _pending_password_jobs -= 1
+
+def shutdown_password_pool():
+    """Stop the password hashing threads."""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -38,6 +80,48 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token() -> Tuple[str, str]:
+    """Create an opaque refresh token; return it with the hash to store."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 256 random bits, so a fast hash is enough to protect them at rest
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def access_token_claims(user: User, session_id: str) -> dict:
+    """Claims that let requests be authorized without loading the user."""
+    return {
+        "sub": user.id,
+        "sid": session_id,
+        "email": user.email,
+        "name": user.name,
+        "role": user.role
+    }
+
+class RevocationList:
+    """Sessions revoked recently enough that their access tokens may still be live.
+    
+    Workers refresh it from the database every REVOCATION_SYNC_SECONDS;
+    sessions revoked by this worker apply immediately.
+    """
+    
+    def __init__(self):
+        self._synced: frozenset = frozenset()
+        self._local: Dict[str, float] = {}
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._synced or session_id in self._local
+    
+    def add(self, session_id: str):
+        self._local[session_id] = time.monotonic()
+    
+    def replace(self, session_ids: Iterable[str], started_at: float):
+        """Install a synced snapshot read from the database after `started_at`."""
+        self._synced = frozenset(session_ids)
+        # Local revocations made while the snapshot was read may be missing from it
+        self._local = {sid: at for sid, at in self._local.items() if at >= started_at}
+
 def verify_token(token: str):
     """Verify and decode a JWT token."""
     try:
@@ -66,7 +150,7 @@ async def get_current_user(
     user_id = payload.get("sub")
     
     # Get user from database
-    user_data = await db.users.find_one({"id": user_id})
+    user_data = await db.users.find_one({"id": user_id}, USER_PROJECTION)
     if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,23 +162,23 @@ async def get_current_user(
 
 async def authenticate_user(email: str, password: str, db: AsyncIOMotorClient):
     """Authenticate a user with email and password."""
-    user_data = await db.users.find_one({"email": email})
+    user_data = await db.users.find_one({"email": email}, USER_PROJECTION)
     if not user_data:
         return False
     
     user = User(**user_data)
-    if not verify_password(password, user.password):
+    if not await run_password_job(verify_password, password, user.password):
         return False
     
     return user
 
 async def create_default_admin(db: AsyncIOMotorClient):
     """Create default admin user if none exists."""
-    admin_exists = await db.users.find_one({"role": "admin"})
+    admin_exists = await db.users.find_one({"role": "admin"}, {"_id": 0, "id": 1})
     if not admin_exists:
         default_admin = User(
             email="admin@portfolio.com",
-            password=get_password_hash("admin123"),
+            password=await run_password_job(get_password_hash, "admin123"),
             name="Portfolio Admin",
             role="admin"
         )
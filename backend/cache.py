@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_KEY = "default"
+
+
+class SectionCache:
+    """In-process read-through cache keyed per collection.
+
+    Every collection can hold several entries (e.g. different query variants),
+    and invalidating a collection drops all of them at once. With
+    `max_entries`, each collection keeps only its most recently used entries.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Tuple[float, Any]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        # Last shared version seen per collection (see apply_versions)
+        self.versions: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _lookup(self, collection: str, key: str):
+        entry = self._entries.get(collection, {}).get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        entries = self._entries[collection]
+        del entries[key]
+        if expires_at <= time.monotonic():
+            return False, None
+        # Re-insert so dict order tracks recency for LRU eviction
+        entries[key] = entry
+        return True, value
+
+    async def get_or_load(
+        self,
+        collection: str,
+        loader: Callable[[], Awaitable[Any]],
+        key: str = DEFAULT_KEY
+    ) -> Any:
+        """Return the cached value, loading it once on a miss."""
+        if not self.enabled:
+            self._misses[collection] = self._misses.get(collection, 0) + 1
+            return await loader()
+
+        found, value = self._lookup(collection, key)
+        if found:
+            self._hits[collection] = self._hits.get(collection, 0) + 1
+            return value
+
+        # Serialize concurrent misses so a cold entry is loaded only once
+        lock = self._locks.setdefault((collection, key), asyncio.Lock())
+        try:
+            async with lock:
+                found, value = self._lookup(collection, key)
+                if found:
+                    self._hits[collection] = self._hits.get(collection, 0) + 1
+                    return value
+
+                self._misses[collection] = self._misses.get(collection, 0) + 1
+                generation = self._generations.get(collection, 0)
+                value = await loader()
+                # Don't store a value that a concurrent write already made stale
+                if generation == self._generations.get(collection, 0):
+                    entries = self._entries.setdefault(collection, {})
+                    entries[key] = (time.monotonic() + self.ttl, value)
+                    if self.max_entries is not None and len(entries) > self.max_entries:
+                        del entries[next(iter(entries))]
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop((collection, key), None)
+
+    def invalidate(self, collection: str):
+        """Drop every cached entry of a collection."""
+        self._generations[collection] = self._generations.get(collection, 0) + 1
+        self._entries.pop(collection, None)
+
+    def clear(self):
+        for collection in list(self._entries):
+            self.invalidate(collection)
+
+    def apply_versions(self, versions: Dict[str, int]) -> List[str]:
+        """Invalidate collections whose shared version moved; return them."""
+        stale = [
+            collection for collection, version in versions.items()
+            if self.versions.get(collection) != version
+        ]
+        for collection in stale:
+            self.invalidate(collection)
+            self.versions[collection] = versions[collection]
+        return stale
+
+    def stats(self) -> dict:
+        hits = sum(self._hits.values())
+        misses = sum(self._misses.values())
+        collections = sorted(set(self._hits) | set(self._misses))
+        return {
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "versions": dict(self.versions),
+            "collections": {
+                name: {
+                    "hits": self._hits.get(name, 0),
+                    "misses": self._misses.get(name, 0),
+                    "entries": len(self._entries.get(name, {}))
+                }
+                for name in collections
+            }
+        }
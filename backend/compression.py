@@ -0,0 +1,178 @@
+import os
+import gzip
+import zlib
+from typing import Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; responses fall back to gzip without it
+    brotli = None
+
+# Bodies smaller than this are sent as they are; headers would eat the saving
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Per-response compression trades ratio for speed; bodies compressed once and
+# cached (see RenderedSection.encoded) can afford the slow settings
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+SNAPSHOT_LEVELS = {"br": 9, "gzip": 9}
+
+COMPRESSIBLE_PREFIXES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def available_encodings() -> tuple:
+    """Supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Content codings named in an Accept-Encoding header, with their q-values."""
+    qualities = {}
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.partition(";")
+        name = name.strip().lower()
+        if name:
+            qualities[name] = _quality(params)
+    return qualities
+
+
+def accepts(qualities: Dict[str, float], encoding: str) -> bool:
+    """Whether a coding is acceptable; an explicit q=0 overrides `*`."""
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts, or None for identity."""
+    qualities = accepted_encodings(accept_encoding)
+    for encoding in available_encodings():
+        if accepts(qualities, encoding):
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of an encoded representation, distinct from the identity one."""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def skip_compression(endpoint):
+    """Opt a route out of CompressionMiddleware."""
+    endpoint.skip_compression = True
+    return endpoint
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=DYNAMIC_LEVELS["br"])
+            self._compress, self._flush = self._compressor.process, self._compressor.finish
+        else:
+            # wbits=31 writes a gzip container
+            self._compressor = zlib.compressobj(DYNAMIC_LEVELS["gzip"], zlib.DEFLATED, 31)
+            self._compress, self._flush = self._compressor.compress, self._compressor.flush
+
+    def process(self, chunk: bytes, last: bool) -> bytes:
+        data = self._compress(chunk)
+        return data + self._flush() if last else data
+
+
+class CompressionMiddleware:
+    """Compress compressible responses with brotli or gzip.
+
+    Responses that already carry a Content-Encoding (precompressed sections
+    and upload siblings), partial content and routes marked with
+    `skip_compression` pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not self._should_compress(scope, message)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                if more_body:
+                    del headers["Content-Length"]
+                    compressor = _StreamCompressor(encoding)
+                else:
+                    body = compress(body, encoding, DYNAMIC_LEVELS[encoding])
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+            await send({
+                "type": "http.response.body",
+                "body": compressor.process(body, last=not more_body),
+                "more_body": more_body
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _should_compress(scope: Scope, message: Message) -> bool:
+        # The router records the matched endpoint in the shared scope
+        if getattr(scope.get("endpoint"), "skip_compression", False):
+            return False
+        if message["status"] in (204, 206, 304):
+            return False
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_PREFIXES)
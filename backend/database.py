@@ -1,118 +1,473 @@
 import os
+import time
+import asyncio
+from typing import NamedTuple
 from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo import ASCENDING, DESCENDING, TEXT, DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
 from models import *
-from datetime import datetime
+from cache import SectionCache, DEFAULT_KEY
+from http_cache import RenderedSection, render_section
+from pagination import DEFAULT_PAGE_SIZE, keyset_page
+from datetime import datetime, timedelta
+
+# Filtered project lists get their own cache bucket, so rarely requested
+# variants cannot evict the full list from the LRU of "projects"
+FILTERED_PROJECTS = "projects:filtered"
+# Cache buckets derived from a collection and dropped along with it
+DERIVED_CACHES = {"projects": [FILTERED_PROJECTS]}
+
+# Indexes ensured at startup: collection -> [(keys, options)].
+# Documents are addressed by `id`, lists sort on `order`, `publish_date`
+# or `created_at` (with `id` as keyset tie-breaker) and login looks up `email`.
+# The upload catalog is also filtered by subfolder and mime type.
+_UNIQUE_ID = ([("id", ASCENDING)], {"unique": True})
+_BY_ORDER = ([("order", ASCENDING)], {})
+
+INDEXES = {
+    "users": [
+        _UNIQUE_ID,
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("role", ASCENDING)], {}),
+    ],
+    "refresh_tokens": [
+        _UNIQUE_ID,
+        ([("token_hash", ASCENDING)], {"unique": True}),
+        ([("previous_token_hash", ASCENDING)], {}),
+        ([("grace_token_hashes", ASCENDING)], {}),
+        ([("user_id", ASCENDING)], {}),
+        ([("revoked_at", ASCENDING)], {}),
+        # Expired sessions are removed by MongoDB's TTL monitor
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "education": [_UNIQUE_ID, _BY_ORDER],
+    "experience": [_UNIQUE_ID, _BY_ORDER],
+    "projects": [
+        _UNIQUE_ID,
+        _BY_ORDER,
+        # Filtered views of /portfolio/projects, each read in display order
+        ([("category", ASCENDING), ("order", ASCENDING)], {}),
+        ([("featured", ASCENDING), ("order", ASCENDING)], {}),
+        ([("technologies", ASCENDING), ("order", ASCENDING)], {}),
+        # /portfolio/search; a collection holds at most one text index
+        (
+            [("title", TEXT), ("description", TEXT), ("technologies", TEXT)],
+            {"name": "search_text", "weights": {"title": 10, "technologies": 5, "description": 2}}
+        ),
+    ],
+    "certifications": [_UNIQUE_ID, _BY_ORDER],
+    "testimonials": [_UNIQUE_ID, _BY_ORDER],
+    "blog_articles": [
+        _UNIQUE_ID,
+        ([("publish_date", DESCENDING), ("id", DESCENDING)], {}),
+        (
+            [("title", TEXT), ("excerpt", TEXT), ("content", TEXT), ("tags", TEXT)],
+            {"name": "search_text", "weights": {"title": 10, "tags": 5, "excerpt": 3, "content": 1}}
+        ),
+    ],
+    "contact_messages": [
+        _UNIQUE_ID,
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("read", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+    ],
+    "uploads": [
+        _UNIQUE_ID,
+        ([("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("subfolder", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("mime_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("filename", ASCENDING)], {}),
+        ([("path", ASCENDING)], {}),
+    ],
+}
+
+class ListCollection(NamedTuple):
+    collection: str
+    model: type
+    create_model: type
+    update_model: type
+    ordered: bool  # sorted by its `order` field
+
+# Collections editable through the generic batch/order admin endpoints,
+# keyed by the name used in their URLs
+LIST_COLLECTIONS = {
+    "education": ListCollection("education", Education, EducationCreate, EducationUpdate, True),
+    "experience": ListCollection("experience", Experience, ExperienceCreate, ExperienceUpdate, True),
+    "projects": ListCollection("projects", Project, ProjectCreate, ProjectUpdate, True),
+    "certifications": ListCollection("certifications", Certification, CertificationCreate, CertificationUpdate, True),
+    "testimonials": ListCollection("testimonials", Testimonial, TestimonialCreate, TestimonialUpdate, True),
+    "blog": ListCollection("blog_articles", BlogArticle, BlogArticleCreate, BlogArticleUpdate, False),
+}
 
 class Database:
-    def __init__(self, mongo_url: str, db_name: str):
+    def __init__(
+        self,
+        mongo_url: str,
+        db_name: str,
+        cache_ttl: float = 300,
+        version_check_interval: float = 1.0,
+        user_cache_ttl: float = 60,
+        user_cache_size: int = 128,
+        cache_variants: int = 64
+    ):
         self.client = AsyncIOMotorClient(mongo_url)
         self.db = self.client[db_name]
+        
+        # Read-through cache for the public getters, keyed per collection.
+        # The aggregated portfolio snapshot lives under the "portfolio" key.
+        # Each collection keeps its `cache_variants` most recently used query
+        # variants (filters, pages, articles), so arbitrary query strings
+        # cannot grow the cache without bound.
+        self.cache = SectionCache(ttl=cache_ttl, max_entries=cache_variants)
+        
+        # Users looked up when refreshing access tokens. Nothing in the API
+        # edits users, so the TTL alone bounds how long a change (e.g. made
+        # in the mongo shell) can go unnoticed; the LRU bound keeps it small.
+        self.user_cache = SectionCache(ttl=user_cache_ttl, max_entries=user_cache_size)
+        
+        # Workers share a version counter per collection in `cache_versions`;
+        # each one polls it at most once per interval to drop stale entries.
+        self.version_check_interval = version_check_interval
+        self._versions_checked_at = float("-inf")
     
     async def close(self):
         self.client.close()
     
+    async def _cached(self, collection: str, loader, key: str = DEFAULT_KEY):
+        await self._sync_cache_versions()
+        return await self.cache.get_or_load(collection, loader, key)
+    
+    async def _sync_cache_versions(self):
+        """Pick up invalidations published by other worker processes."""
+        if not self.cache.enabled:
+            return
+        now = time.monotonic()
+        if now - self._versions_checked_at < self.version_check_interval:
+            return
+        self._versions_checked_at = now
+        
+        docs = await self.db.cache_versions.find().to_list(length=None)
+        versions = {doc["_id"]: doc["version"] for doc in docs}
+        stale = self.cache.apply_versions(versions)
+        for collection in stale:
+            for derived in DERIVED_CACHES.get(collection, ()):
+                self.cache.invalidate(derived)
+        if stale:
+            self.cache.invalidate("portfolio")
+    
+    async def _publish_version(self, collection: str) -> int:
+        """Bump a collection's shared version so other workers drop their copies."""
+        doc = await self.db.cache_versions.find_one_and_update(
+            {"_id": collection},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+    
+    async def _invalidate(self, collection: str):
+        """Drop cached data derived from a collection after a write."""
+        self.cache.invalidate(collection)
+        for derived in DERIVED_CACHES.get(collection, ()):
+            self.cache.invalidate(derived)
+        self.cache.invalidate("portfolio")
+        self.cache.versions[collection] = await self._publish_version(collection)
+    
+    async def ensure_indexes(self) -> List[str]:
+        """Create any missing index from INDEXES; return the ones created."""
+        created = []
+        for collection_name, indexes in INDEXES.items():
+            collection = self.db[collection_name]
+            existing = set(await collection.index_information())
+            for keys, options in indexes:
+                try:
+                    name = await collection.create_index(keys, **options)
+                except OperationFailure as e:
+                    # e.g. duplicates blocking a unique index; keep going
+                    print(f"⚠️  Could not create index {keys} on {collection_name}: {e}")
+                    continue
+                if name not in existing:
+                    created.append(f"{collection_name}.{name}")
+        return created
+    
+    async def clear_cache(self):
+        """Empty the cache in this worker and every other one."""
+        self.cache.clear()
+        self.user_cache.clear()
+        await self.db.cache_versions.update_many({}, {"$inc": {"version": 1}})
+    
+    async def get_rendered(self, collection: str, loader, key: str = "rendered") -> RenderedSection:
+        """Serialized body and ETag of a public section, cached next to it."""
+        async def render():
+            return render_section(await loader())
+        return await self._cached(collection, render, key)
+    
+    async def _update_singleton(self, collection: str, model, default, update_data: dict):
+        """Update a single-document section in one round trip.
+        
+        Unset fields come from `default` when the document does not exist yet.
+        """
+        update_data = {**update_data, "updated_at": datetime.utcnow()}
+        insert_data = {k: v for k, v in default.dict().items() if k not in update_data}
+        data = await self.db[collection].find_one_and_update(
+            {},
+            {"$set": update_data, "$setOnInsert": insert_data},
+            projection=projection(model),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await self._invalidate(collection)
+        return model(**data)
+    
+    # Portfolio Snapshot Methods
+    async def get_portfolio(self) -> PortfolioSnapshot:
+        return await self._cached("portfolio", self._build_portfolio)
+    
+    async def _build_portfolio(self) -> PortfolioSnapshot:
+        (
+            hero, about, education, experience, skills,
+            projects, certifications, testimonials, blog, blog_count, settings
+        ) = await asyncio.gather(
+            self.get_hero(),
+            self.get_about(),
+            self.get_education(),
+            self.get_experience(),
+            self.get_skills(),
+            self.get_projects(),
+            self.get_certifications(),
+            self.get_testimonials(),
+            self.get_blog_articles(),
+            self.get_blog_article_count(),
+            self.get_settings(),
+        )
+        return PortfolioSnapshot(
+            hero=hero,
+            about=about,
+            education=education,
+            experience=experience,
+            skills=skills,
+            projects=projects,
+            certifications=certifications,
+            testimonials=testimonials,
+            blog=blog.items,
+            blog_next_cursor=blog.next_cursor,
+            blog_count=blog_count,
+            settings=settings
+        )
+    
+    # User Methods
+    async def get_user(self, user_id: str) -> Optional[User]:
+        """User by id, served from the user cache when fresh enough."""
+        return await self.user_cache.get_or_load(
+            "users", lambda: self._load_user(user_id), key=user_id
+        )
+    
+    async def _load_user(self, user_id: str) -> Optional[User]:
+        data = await self.db.users.find_one({"id": user_id}, USER_PROJECTION)
+        return User(**data) if data else None
+    
+    # Auth Session Methods
+    async def create_session(self, user_id: str, token_hash: str, expires_at: datetime) -> AuthSession:
+        session = AuthSession(user_id=user_id, token_hash=token_hash, expires_at=expires_at)
+        await self.db.refresh_tokens.insert_one(session.dict())
+        return session
+    
+    async def rotate_session(
+        self, token_hash: str, new_token_hash: str, grace: timedelta = timedelta(0)
+    ) -> Optional[AuthSession]:
+        """Swap a session's refresh token for a new one.
+        
+        Returns None for unknown, expired or revoked tokens. Presenting a token
+        that was already rotated revokes its session, as it must have leaked,
+        unless it was rotated less than `grace` ago: that is another tab
+        refreshing with the same token. It gets a token of its own, valid next
+        to the current one, so whichever tab stores its token last keeps working.
+        """
+        now = datetime.utcnow()
+        data = await self.db.refresh_tokens.find_one_and_update(
+            {
+                "$or": [{"token_hash": token_hash}, {"grace_token_hashes": token_hash}],
+                "revoked_at": None,
+                "expires_at": {"$gt": now}
+            },
+            {"$set": {
+                "token_hash": new_token_hash,
+                "previous_token_hash": token_hash,
+                "grace_token_hashes": [],
+                "rotated_at": now,
+                "updated_at": now
+            }},
+            projection=AUTH_SESSION_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+        if data:
+            return AuthSession(**data)
+        
+        # rotated_at is left alone so repeated reuse cannot stretch the window
+        data = await self.db.refresh_tokens.find_one_and_update(
+            {
+                "previous_token_hash": token_hash,
+                "revoked_at": None,
+                "expires_at": {"$gt": now},
+                "rotated_at": {"$gt": now - grace}
+            },
+            {"$push": {"grace_token_hashes": new_token_hash}, "$set": {"updated_at": now}},
+            projection=AUTH_SESSION_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+        if data:
+            return AuthSession(**data)
+        
+        reused = await self.db.refresh_tokens.find_one(
+            {"previous_token_hash": token_hash, "revoked_at": None}, {"_id": 0, "id": 1}
+        )
+        if reused:
+            await self.revoke_session(reused["id"])
+        return None
+    
+    async def revoke_session(self, session_id: str) -> bool:
+        now = datetime.utcnow()
+        result = await self.db.refresh_tokens.update_one(
+            {"id": session_id, "revoked_at": None},
+            {"$set": {"revoked_at": now, "updated_at": now}}
+        )
+        return result.modified_count > 0
+    
+    async def get_revoked_sessions(self, since: datetime) -> List[str]:
+        """Ids of sessions revoked at or after `since`."""
+        cursor = self.db.refresh_tokens.find({"revoked_at": {"$gte": since}}, {"_id": 0, "id": 1})
+        return [doc["id"] async for doc in cursor]
+    
     # Hero Section Methods
     async def get_hero(self) -> HeroSection:
-        data = await self.db.hero.find_one()
+        return await self._cached("hero", self._load_hero)
+    
+    @staticmethod
+    def _default_hero() -> HeroSection:
+        return HeroSection(
+            name="Your Name",
+            job_title="Your Job Title",
+            tagline="Your professional tagline"
+        )
+    
+    async def _load_hero(self) -> HeroSection:
+        data = await self.db.hero.find_one({}, HERO_PROJECTION)
         if not data:
             # Create default hero section
-            default_hero = HeroSection(
-                name="Your Name",
-                job_title="Your Job Title",
-                tagline="Your professional tagline"
-            )
+            default_hero = self._default_hero()
             await self.db.hero.replace_one({}, default_hero.dict(), upsert=True)
             return default_hero
         return HeroSection(**data)
     
     async def update_hero(self, hero_data: HeroUpdate) -> HeroSection:
         update_data = {k: v for k, v in hero_data.dict().items() if v is not None}
-        update_data["updated_at"] = datetime.utcnow()
-        
-        await self.db.hero.update_one({}, {"$set": update_data}, upsert=True)
-        return await self.get_hero()
+        return await self._update_singleton("hero", HeroSection, self._default_hero(), update_data)
     
     # About Section Methods
     async def get_about(self) -> AboutSection:
-        data = await self.db.about.find_one()
+        return await self._cached("about", self._load_about)
+    
+    @staticmethod
+    def _default_about() -> AboutSection:
+        return AboutSection(
+            description="Your professional description",
+            long_description="Additional details about yourself",
+            location="Your Location",
+            years_of_experience=0,
+            projects_completed=0
+        )
+    
+    async def _load_about(self) -> AboutSection:
+        data = await self.db.about.find_one({}, ABOUT_PROJECTION)
         if not data:
-            default_about = AboutSection(
-                description="Your professional description",
-                long_description="Additional details about yourself",
-                location="Your Location",
-                years_of_experience=0,
-                projects_completed=0
-            )
+            default_about = self._default_about()
             await self.db.about.replace_one({}, default_about.dict(), upsert=True)
             return default_about
         return AboutSection(**data)
     
     async def update_about(self, about_data: AboutUpdate) -> AboutSection:
         update_data = {k: v for k, v in about_data.dict().items() if v is not None}
-        update_data["updated_at"] = datetime.utcnow()
-        
-        await self.db.about.update_one({}, {"$set": update_data}, upsert=True)
-        return await self.get_about()
+        return await self._update_singleton("about", AboutSection, self._default_about(), update_data)
     
     # Education Methods
     async def get_education(self) -> List[Education]:
-        cursor = self.db.education.find().sort("order", 1)
+        return await self._cached("education", self._load_education)
+    
+    async def _load_education(self) -> List[Education]:
+        cursor = self.db.education.find({}, EDUCATION_PROJECTION).sort("order", 1)
         education_list = await cursor.to_list(length=None)
         return [Education(**edu) for edu in education_list]
     
     async def create_education(self, education_data: EducationCreate) -> Education:
         education = Education(**education_data.dict())
         await self.db.education.insert_one(education.dict())
+        await self._invalidate("education")
         return education
     
     async def update_education(self, edu_id: str, education_data: EducationUpdate) -> Education:
         update_data = {k: v for k, v in education_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.education.update_one(
-            {"id": edu_id}, {"$set": update_data}
+        # One round trip: update and read back the new version atomically
+        edu_data = await self.db.education.find_one_and_update(
+            {"id": edu_id},
+            {"$set": update_data},
+            projection=EDUCATION_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if edu_data is None:
             raise ValueError("Education entry not found")
         
-        edu_data = await self.db.education.find_one({"id": edu_id})
+        await self._invalidate("education")
         return Education(**edu_data)
     
     async def delete_education(self, edu_id: str) -> bool:
         result = await self.db.education.delete_one({"id": edu_id})
+        await self._invalidate("education")
         return result.deleted_count > 0
     
     # Experience Methods
     async def get_experience(self) -> List[Experience]:
-        cursor = self.db.experience.find().sort("order", 1)
+        return await self._cached("experience", self._load_experience)
+    
+    async def _load_experience(self) -> List[Experience]:
+        cursor = self.db.experience.find({}, EXPERIENCE_PROJECTION).sort("order", 1)
         experience_list = await cursor.to_list(length=None)
         return [Experience(**exp) for exp in experience_list]
     
     async def create_experience(self, experience_data: ExperienceCreate) -> Experience:
         experience = Experience(**experience_data.dict())
         await self.db.experience.insert_one(experience.dict())
+        await self._invalidate("experience")
         return experience
     
     async def update_experience(self, exp_id: str, experience_data: ExperienceUpdate) -> Experience:
         update_data = {k: v for k, v in experience_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.experience.update_one(
-            {"id": exp_id}, {"$set": update_data}
+        exp_data = await self.db.experience.find_one_and_update(
+            {"id": exp_id},
+            {"$set": update_data},
+            projection=EXPERIENCE_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if exp_data is None:
             raise ValueError("Experience entry not found")
         
-        exp_data = await self.db.experience.find_one({"id": exp_id})
+        await self._invalidate("experience")
         return Experience(**exp_data)
     
     async def delete_experience(self, exp_id: str) -> bool:
         result = await self.db.experience.delete_one({"id": exp_id})
+        await self._invalidate("experience")
         return result.deleted_count > 0
     
     # Skills Methods
     async def get_skills(self) -> Skills:
-        data = await self.db.skills.find_one()
+        return await self._cached("skills", self._load_skills)
+    
+    async def _load_skills(self) -> Skills:
+        data = await self.db.skills.find_one({}, SKILLS_PROJECTION)
         if not data:
             default_skills = Skills()
             await self.db.skills.replace_one({}, default_skills.dict(), upsert=True)
@@ -121,126 +476,218 @@ class Database:
     
     async def update_skills(self, skills_data: SkillsUpdate) -> Skills:
         update_data = {k: v for k, v in skills_data.dict().items() if v is not None}
-        update_data["updated_at"] = datetime.utcnow()
-        
-        await self.db.skills.update_one({}, {"$set": update_data}, upsert=True)
-        return await self.get_skills()
+        return await self._update_singleton("skills", Skills, Skills(), update_data)
     
     # Projects Methods
-    async def get_projects(self) -> List[Project]:
-        cursor = self.db.projects.find().sort("order", 1)
-        projects_list = await cursor.to_list(length=None)
+    async def get_projects(
+        self,
+        category: Optional[str] = None,
+        featured: Optional[bool] = None,
+        technology: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Project]:
+        """All projects (cached), or a filtered list read straight from the database.
+        
+        Filtered lists are cached by the caller as rendered bodies under
+        FILTERED_PROJECTS.
+        """
+        filters = {"category": category, "featured": featured, "technologies": technology}
+        query = {field: value for field, value in filters.items() if value is not None}
+        if not query and limit is None:
+            return await self._cached("projects", self._load_projects)
+        return await self._load_projects(query, limit)
+    
+    async def _load_projects(self, query: Optional[dict] = None, limit: Optional[int] = None) -> List[Project]:
+        cursor = self.db.projects.find(query or {}, PROJECT_PROJECTION).sort("order", 1)
+        if limit:
+            cursor = cursor.limit(limit)
+        projects_list = await cursor.to_list(length=limit)
         return [Project(**proj) for proj in projects_list]
     
+    async def get_project_categories(self) -> List[ProjectCategory]:
+        return await self._cached("projects", self._load_project_categories, "categories")
+    
+    async def _load_project_categories(self) -> List[ProjectCategory]:
+        pipeline = [
+            {"$group": {
+                "_id": "$category",
+                "count": {"$sum": 1},
+                "featured": {"$sum": {"$cond": ["$featured", 1, 0]}}
+            }},
+            {"$sort": {"_id": 1}}
+        ]
+        groups = await self.db.projects.aggregate(pipeline).to_list(length=None)
+        return [
+            ProjectCategory(category=group["_id"], count=group["count"], featured=group["featured"])
+            for group in groups
+        ]
+    
     async def create_project(self, project_data: ProjectCreate) -> Project:
         project = Project(**project_data.dict())
         await self.db.projects.insert_one(project.dict())
+        await self._invalidate("projects")
         return project
     
     async def update_project(self, proj_id: str, project_data: ProjectUpdate) -> Project:
         update_data = {k: v for k, v in project_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.projects.update_one(
-            {"id": proj_id}, {"$set": update_data}
+        proj_data = await self.db.projects.find_one_and_update(
+            {"id": proj_id},
+            {"$set": update_data},
+            projection=PROJECT_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if proj_data is None:
             raise ValueError("Project not found")
         
-        proj_data = await self.db.projects.find_one({"id": proj_id})
+        await self._invalidate("projects")
         return Project(**proj_data)
     
     async def delete_project(self, proj_id: str) -> bool:
         result = await self.db.projects.delete_one({"id": proj_id})
+        await self._invalidate("projects")
         return result.deleted_count > 0
     
     # Certifications Methods
     async def get_certifications(self) -> List[Certification]:
-        cursor = self.db.certifications.find().sort("order", 1)
+        return await self._cached("certifications", self._load_certifications)
+    
+    async def _load_certifications(self) -> List[Certification]:
+        cursor = self.db.certifications.find({}, CERTIFICATION_PROJECTION).sort("order", 1)
         certs_list = await cursor.to_list(length=None)
         return [Certification(**cert) for cert in certs_list]
     
     async def create_certification(self, cert_data: CertificationCreate) -> Certification:
         certification = Certification(**cert_data.dict())
         await self.db.certifications.insert_one(certification.dict())
+        await self._invalidate("certifications")
         return certification
     
     async def update_certification(self, cert_id: str, cert_data: CertificationUpdate) -> Certification:
         update_data = {k: v for k, v in cert_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.certifications.update_one(
-            {"id": cert_id}, {"$set": update_data}
+        cert_data = await self.db.certifications.find_one_and_update(
+            {"id": cert_id},
+            {"$set": update_data},
+            projection=CERTIFICATION_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if cert_data is None:
             raise ValueError("Certification not found")
         
-        cert_data = await self.db.certifications.find_one({"id": cert_id})
+        await self._invalidate("certifications")
         return Certification(**cert_data)
     
     async def delete_certification(self, cert_id: str) -> bool:
         result = await self.db.certifications.delete_one({"id": cert_id})
+        await self._invalidate("certifications")
         return result.deleted_count > 0
     
     # Testimonials Methods
     async def get_testimonials(self) -> List[Testimonial]:
-        cursor = self.db.testimonials.find().sort("order", 1)
+        return await self._cached("testimonials", self._load_testimonials)
+    
+    async def _load_testimonials(self) -> List[Testimonial]:
+        cursor = self.db.testimonials.find({}, TESTIMONIAL_PROJECTION).sort("order", 1)
         testimonials_list = await cursor.to_list(length=None)
         return [Testimonial(**test) for test in testimonials_list]
     
     async def create_testimonial(self, testimonial_data: TestimonialCreate) -> Testimonial:
         testimonial = Testimonial(**testimonial_data.dict())
         await self.db.testimonials.insert_one(testimonial.dict())
+        await self._invalidate("testimonials")
         return testimonial
     
     async def update_testimonial(self, test_id: str, testimonial_data: TestimonialUpdate) -> Testimonial:
         update_data = {k: v for k, v in testimonial_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.testimonials.update_one(
-            {"id": test_id}, {"$set": update_data}
+        test_data = await self.db.testimonials.find_one_and_update(
+            {"id": test_id},
+            {"$set": update_data},
+            projection=TESTIMONIAL_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if test_data is None:
             raise ValueError("Testimonial not found")
         
-        test_data = await self.db.testimonials.find_one({"id": test_id})
+        await self._invalidate("testimonials")
         return Testimonial(**test_data)
     
     async def delete_testimonial(self, test_id: str) -> bool:
         result = await self.db.testimonials.delete_one({"id": test_id})
+        await self._invalidate("testimonials")
         return result.deleted_count > 0
     
     # Blog Methods
-    async def get_blog_articles(self) -> List[BlogArticle]:
-        cursor = self.db.blog_articles.find().sort("publish_date", -1)
-        articles_list = await cursor.to_list(length=None)
-        return [BlogArticle(**article) for article in articles_list]
+    async def get_blog_articles(
+        self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> BlogArticlePage:
+        if cursor:
+            # Deeper pages are index range scans and are not worth caching
+            return await self._load_blog_page(limit, cursor)
+        return await self._cached(
+            "blog_articles", lambda: self._load_blog_page(limit), f"page:{limit}"
+        )
+    
+    async def _load_blog_page(self, limit: int, cursor: Optional[str] = None) -> BlogArticlePage:
+        items, next_cursor = await keyset_page(
+            self.db.blog_articles, {}, BLOG_ARTICLE_SUMMARY_PROJECTION,
+            "publish_date", limit, cursor, BlogArticleSummary
+        )
+        return BlogArticlePage(items=items, next_cursor=next_cursor)
+    
+    async def get_blog_article_count(self) -> int:
+        return await self._cached(
+            "blog_articles", lambda: self.db.blog_articles.count_documents({}), "count"
+        )
+    
+    async def get_blog_article(self, article_id: str) -> BlogArticle:
+        return await self._cached(
+            "blog_articles", lambda: self._load_blog_article(article_id), f"article:{article_id}"
+        )
+    
+    async def _load_blog_article(self, article_id: str) -> BlogArticle:
+        article_data = await self.db.blog_articles.find_one({"id": article_id}, BLOG_ARTICLE_PROJECTION)
+        if not article_data:
+            raise ValueError("Blog article not found")
+        return BlogArticle(**article_data)
     
     async def create_blog_article(self, article_data: BlogArticleCreate) -> BlogArticle:
         article = BlogArticle(**article_data.dict())
         await self.db.blog_articles.insert_one(article.dict())
+        await self._invalidate("blog_articles")
         return article
     
     async def update_blog_article(self, article_id: str, article_data: BlogArticleUpdate) -> BlogArticle:
         update_data = {k: v for k, v in article_data.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.db.blog_articles.update_one(
-            {"id": article_id}, {"$set": update_data}
+        article_data = await self.db.blog_articles.find_one_and_update(
+            {"id": article_id},
+            {"$set": update_data},
+            projection=BLOG_ARTICLE_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        if result.matched_count == 0:
+        if article_data is None:
             raise ValueError("Blog article not found")
         
-        article_data = await self.db.blog_articles.find_one({"id": article_id})
+        await self._invalidate("blog_articles")
         return BlogArticle(**article_data)
     
     async def delete_blog_article(self, article_id: str) -> bool:
         result = await self.db.blog_articles.delete_one({"id": article_id})
+        await self._invalidate("blog_articles")
         return result.deleted_count > 0
     
     # Settings Methods
     async def get_settings(self) -> SiteSettings:
-        data = await self.db.settings.find_one()
+        return await self._cached("settings", self._load_settings)
+    
+    async def _load_settings(self) -> SiteSettings:
+        data = await self.db.settings.find_one({}, SETTINGS_PROJECTION)
         if not data:
             default_settings = SiteSettings()
             await self.db.settings.replace_one({}, default_settings.dict(), upsert=True)
@@ -249,10 +696,88 @@ class Database:
     
     async def update_settings(self, settings_data: SiteSettingsUpdate) -> SiteSettings:
         update_data = {k: v for k, v in settings_data.dict().items() if v is not None}
-        update_data["updated_at"] = datetime.utcnow()
+        return await self._update_singleton("settings", SiteSettings, SiteSettings(), update_data)
+    
+    # Batch Methods
+    async def batch_write(self, name: str, operations: List[BatchOperation]) -> BatchResult:
+        """Apply create/update/delete operations to a list collection in one bulk_write.
+        
+        Every operation is validated before anything is written; operations
+        then run in request order.
+        """
+        spec = LIST_COLLECTIONS[name]
+        now = datetime.utcnow()
+        requests, created = [], []
+        for index, operation in enumerate(operations):
+            if operation.op != "create" and not operation.id:
+                raise ValueError(f"Operation {index}: {operation.op} requires an id")
+            try:
+                if operation.op == "create":
+                    document = spec.model(**spec.create_model(**(operation.data or {})).dict())
+                    requests.append(InsertOne(document.dict()))
+                    created.append(document.id)
+                elif operation.op == "update":
+                    changes = spec.update_model(**(operation.data or {})).dict()
+                    update_data = {k: v for k, v in changes.items() if v is not None}
+                    update_data["updated_at"] = now
+                    requests.append(UpdateOne({"id": operation.id}, {"$set": update_data}))
+                else:
+                    requests.append(DeleteOne({"id": operation.id}))
+            except ValidationError as e:
+                problems = "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+                )
+                raise ValueError(f"Operation {index}: {problems}")
         
-        await self.db.settings.update_one({}, {"$set": update_data}, upsert=True)
-        return await self.get_settings()
+        result = await self.db[spec.collection].bulk_write(requests, ordered=True)
+        await self._invalidate(spec.collection)
+        return BatchResult(created=created, updated=result.matched_count, deleted=result.deleted_count)
+    
+    async def reorder(self, name: str, ids: List[str]) -> int:
+        """Set `order` from the position of each id in one bulk_write; return matches."""
+        spec = LIST_COLLECTIONS[name]
+        if not spec.ordered:
+            raise ValueError(f"{name} has no manual order")
+        
+        now = datetime.utcnow()
+        requests = [
+            UpdateOne({"id": doc_id}, {"$set": {"order": position, "updated_at": now}})
+            for position, doc_id in enumerate(ids)
+        ]
+        result = await self.db[spec.collection].bulk_write(requests, ordered=False)
+        await self._invalidate(spec.collection)
+        return result.matched_count
+    
+    # Search Methods
+    async def search(self, text: str, limit: int = 10) -> List[SearchResult]:
+        """Blog articles and projects matching `text`, best text score first."""
+        query = {"$text": {"$search": text}}
+        score = {"score": {"$meta": "textScore"}}
+        
+        def ranked(collection: str, fields: List[str]):
+            return self.db[collection].find(
+                query, {"_id": 0, **{field: 1 for field in fields}, **score}
+            ).sort(list(score.items())).limit(limit).to_list(length=limit)
+        
+        articles, projects = await asyncio.gather(
+            ranked("blog_articles", ["id", "title", "excerpt", "tags", "image"]),
+            ranked("projects", ["id", "title", "description", "technologies", "image"]),
+        )
+        results = [
+            SearchResult(
+                type="blog", id=doc["id"], title=doc["title"], summary=doc["excerpt"],
+                tags=doc.get("tags", []), image=doc.get("image"), score=doc["score"]
+            )
+            for doc in articles
+        ] + [
+            SearchResult(
+                type="project", id=doc["id"], title=doc["title"], summary=doc["description"],
+                tags=doc.get("technologies", []), image=doc.get("image"), score=doc["score"]
+            )
+            for doc in projects
+        ]
+        results.sort(key=lambda result: result.score, reverse=True)
+        return results[:limit]
     
     # Contact Messages Methods
     async def create_contact_message(self, message_data: ContactMessageCreate) -> ContactMessage:
@@ -260,7 +785,30 @@ class Database:
         await self.db.contact_messages.insert_one(message.dict())
         return message
     
-    async def get_contact_messages(self) -> List[ContactMessage]:
-        cursor = self.db.contact_messages.find().sort("created_at", -1)
-        messages_list = await cursor.to_list(length=None)
-        return [ContactMessage(**msg) for msg in messages_list]
\ No newline at end of file
+    async def get_contact_messages(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        read: Optional[bool] = None
+    ) -> ContactMessagePage:
+        query = {}
+        if read is not None:
+            query["read"] = read
+        items, next_cursor = await keyset_page(
+            self.db.contact_messages, query, CONTACT_MESSAGE_PROJECTION,
+            "created_at", limit, cursor, ContactMessage
+        )
+        return ContactMessagePage(items=items, next_cursor=next_cursor)
+    
+    async def count_contact_messages(self) -> ContactMessageCounts:
+        # The total comes from collection metadata; unread is an index count
+        total = await self.db.contact_messages.estimated_document_count()
+        unread = await self.db.contact_messages.count_documents({"read": False})
+        return ContactMessageCounts(total=total, unread=unread, read=max(total - unread, 0))
+    
+    async def mark_contact_messages(self, message_ids: List[str], read: bool = True) -> int:
+        result = await self.db.contact_messages.update_many(
+            {"id": {"$in": message_ids}},
+            {"$set": {"read": read, "updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count
@@ -1,27 +1,261 @@
 import os
+import re
+import gzip
 import shutil
 import uuid
+import hashlib
+import asyncio
+import mimetypes
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 from fastapi import UploadFile, HTTPException
-from PIL import Image
+from pymongo import ReturnDocument
+from PIL import Image, UnidentifiedImageError, features
 import aiofiles
+from models import UPLOADED_FILE_PROJECTION, UploadedFile, UploadedFilePage
+from pagination import DEFAULT_PAGE_SIZE, keyset_page
+from storage import IMMUTABLE_CACHE_CONTROL, create_storage
 
-# Upload configuration
-UPLOAD_DIR = Path("/app/backend/uploads")
+try:
+    import brotli
+except ImportError:  # optional; only gzip siblings are written without it
+    brotli = None
+
+# Upload configuration. With a remote storage backend the upload directory
+# is only scratch space for staging and processing.
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "/app/backend/uploads"))
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read/write unit while streaming uploads
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 ALLOWED_FILE_TYPES = ALLOWED_IMAGE_TYPES.union({"application/pdf"})
 
+# Uploads are stored by the SHA-256 of their bytes, so URLs never change
+# content and identical files are written once.
+CAS_DIR = "cas"
+INCOMING_DIR = ".incoming"
+CAS_FILENAME = re.compile(r"([0-9a-f]{64})\.[a-z0-9]+")
+FILE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "application/pdf": ".pdf",
+}
+MIME_TYPES = {extension: mime_type for mime_type, extension in FILE_EXTENSIONS.items()}
+EMPTY_IMAGE_INFO = {"width": None, "height": None, "format": None, "variants": []}
+
+# The upload that creates a blob's `upload_refs` entry processes the blob while
+# the entry is "processing"; concurrent uploads of the same bytes poll until it
+# is "ready", and take the work over when it "failed" or the claim went stale
+# (its worker died).
+BLOB_CLAIM_TIMEOUT = timedelta(seconds=int(os.getenv("BLOB_CLAIM_TIMEOUT_SECONDS", "300")))
+BLOB_POLL_INTERVAL = 0.2
+
+# Types that get precompressed .br/.gz siblings, kept only when they save
+# at least PRECOMPRESS_MIN_SAVING of the original size
+COMPRESSIBLE_TYPES = {"application/pdf", "image/svg+xml"}
+PRECOMPRESS_MIN_SAVING = 0.1
+
+# Image processing runs in a process pool so Pillow never blocks the event loop
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", "16"))  # running + waiting jobs
+# On-demand derivatives (/api/files/...?w=) are requested anonymously, so they
+# get their own, smaller queue and can never fill the one uploads rely on
+DERIVATIVE_QUEUE_LIMIT = int(os.getenv("DERIVATIVE_QUEUE_LIMIT", "2"))
+IMAGE_QUEUE_LIMITS = {"uploads": IMAGE_QUEUE_LIMIT, "derivatives": DERIVATIVE_QUEUE_LIMIT}
+
+# Responsive variants generated for every uploaded image. Formats are
+# encoder names ("webp", "avif") or "original" for the uploaded format.
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280,1920").split(",") if w.strip()]
+IMAGE_VARIANT_FORMATS = [f.strip().lower() for f in os.getenv("IMAGE_VARIANT_FORMATS", "webp,original").split(",") if f.strip()]
+VARIANT_SEPARATOR = "@"  # variants are named <stem>@<width>w.<ext>
+
+VARIANT_ENCODERS = {
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "avif", "image/avif", {"quality": 60}),
+    "jpeg": ("JPEG", "jpg", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+    "png": ("PNG", "png", "image/png", {"optimize": True}),
+    "gif": ("GIF", "gif", "image/gif", {}),
+}
+
 # Create upload directory if it doesn't exist
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+def optimize_image(file_path: str):
+    """Optimize image file for web use (runs in a worker process)."""
+    with Image.open(file_path) as img:
+        # Convert to RGB if necessary
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        
+        # Resize if too large
+        max_dimension = 1920
+        if max(img.size) > max_dimension:
+            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        
+        # Save optimized image
+        img.save(file_path, optimize=True, quality=85)
+
+def _encoder_available(name: str) -> bool:
+    if name == "avif":
+        return ".avif" in Image.registered_extensions()
+    if name == "webp":
+        return features.check("webp")
+    return True
+
+def generate_variants(file_path: str, widths: list, formats: list) -> dict:
+    """Write resized copies of an image next to it (runs in a worker process).
+    
+    Returns the source dimensions along with the variant manifest.
+    """
+    source = Path(file_path)
+    variants = []
+    with Image.open(source) as img:
+        original = (img.format or "").lower().replace("mpo", "jpeg")
+        result = {"width": img.width, "height": img.height, "format": original, "variants": variants}
+        # Animated images would lose their frames; serve them as uploaded
+        if getattr(img, "is_animated", False):
+            return result
+        img.load()
+        
+        for width in sorted(set(widths)):
+            if width >= img.width:
+                continue
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.Resampling.LANCZOS)
+            
+            for name in formats:
+                name = original if name == "original" else name
+                if name not in VARIANT_ENCODERS or not _encoder_available(name):
+                    continue
+                pil_format, extension, mime_type, options = VARIANT_ENCODERS[name]
+                frame = resized
+                if pil_format == "JPEG" and frame.mode not in ("RGB", "L"):
+                    frame = frame.convert("RGB")
+                
+                target = source.with_name(f"{source.stem}{VARIANT_SEPARATOR}{width}w.{extension}")
+                frame.save(target, pil_format, **options)
+                variants.append({
+                    "filename": target.name,
+                    "width": width,
+                    "height": height,
+                    "format": name,
+                    "mime_type": mime_type,
+                    "size": target.stat().st_size
+                })
+    return result
+
+def precompress(file_path: str) -> list:
+    """Write .br/.gz siblings of a file (runs in a worker process)."""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    
+    encoders = [("gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.insert(0, ("br", lambda raw: brotli.compress(raw, quality=11)))
+    
+    written = []
+    for suffix, compress in encoders:
+        encoded = compress(data)
+        if len(encoded) <= len(data) * (1 - PRECOMPRESS_MIN_SAVING):
+            with open(f"{file_path}.{suffix}", "wb") as f:
+                f.write(encoded)
+            written.append(suffix)
+    return written
+
+def render_derivative(source: str, target: str, width: Optional[int], height: Optional[int], fmt: str):
+    """Fit an image inside width x height and encode it (runs in a worker process)."""
+    pil_format, _, _, options = VARIANT_ENCODERS[fmt]
+    with Image.open(source) as img:
+        img.load()
+        # Never upscale; a missing bound keeps the aspect ratio
+        box = (min(width or img.width, img.width), min(height or img.height, img.height))
+        if box != img.size:
+            img.thumbnail(box, Image.Resampling.LANCZOS)
+        if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        
+        # Write to a temporary name so readers never see a partial file
+        partial = f"{target}.{os.getpid()}.part"
+        img.save(partial, pil_format, **options)
+    os.replace(partial, target)
 
 class FileUploadManager:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.upload_dir = UPLOAD_DIR
+        self._storage = storage
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending_jobs = {queue: 0 for queue in IMAGE_QUEUE_LIMITS}
+    
+    @property
+    def storage(self):
+        # Created on first use so settings loaded from .env after import apply
+        if self._storage is None:
+            self._storage = create_storage(self.upload_dir)
+        return self._storage
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" avoids forking a process that already runs an event loop and threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    async def run_image_job(self, func, *args, queue: str = "uploads"):
+        """Run a CPU-bound media processing function in the process pool.
+        
+        Jobs count against the limit of their queue ("uploads" or
+        "derivatives"); a full queue answers 503.
+        """
+        if self._pending_jobs[queue] >= IMAGE_QUEUE_LIMITS[queue]:
+            raise HTTPException(
+                status_code=503,
+                detail="Image processing queue is full, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+        
+        self._pending_jobs[queue] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); start a fresh pool next time
+            self._executor = None
+            raise
+        finally:
+            self._pending_jobs[queue] -= 1
+    
+    def shutdown(self):
+        """Stop the image worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
-    async def save_file(self, file: UploadFile, subfolder: Optional[str] = None) -> dict:
-        """Save uploaded file and return file info."""
+    def blob_path(self, digest: str, mime_type: str) -> Path:
+        """Content-addressed location of an upload: cas/ab/cd/<sha256><ext>."""
+        return self.upload_dir / CAS_DIR / digest[:2] / digest[2:4] / f"{digest}{FILE_EXTENSIONS[mime_type]}"
+    
+    def key_for(self, file_path: Path) -> str:
+        """Storage key of a file in the upload directory."""
+        return file_path.relative_to(self.upload_dir).as_posix()
+    
+    def url_for(self, file_path: Path) -> str:
+        return f"/api/files/{self.key_for(file_path)}"
+    
+    async def save_file(self, file: UploadFile, subfolder: Optional[str], db) -> dict:
+        """Save uploaded file by content hash and return file info.
+        
+        Identical bytes are stored once; every upload of them adds a reference
+        in `upload_refs`, which `delete_upload` releases again. Each upload is
+        also recorded in the `uploads` catalog that backs `list_files`.
+        """
+        incoming_path = None
         try:
             # Validate file type
             if file.content_type not in ALLOWED_FILE_TYPES:
@@ -30,77 +264,259 @@ class FileUploadManager:
                     detail=f"File type {file.content_type} not allowed"
                 )
             
-            # Create subfolder if specified
-            upload_path = self.upload_dir
-            if subfolder:
-                upload_path = upload_path / subfolder
-                upload_path.mkdir(exist_ok=True)
+            # Reject early when the client announced an oversized body
+            if file.size is not None and file.size > MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File too large. Maximum size is {MAX_FILE_SIZE / 1024 / 1024}MB"
+                )
             
-            # Generate unique filename
-            file_extension = Path(file.filename).suffix.lower()
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = upload_path / unique_filename
+            # Stream to a staging file chunk by chunk, enforcing the size limit
+            # and hashing as we go so memory stays bounded by the chunk size
+            incoming_dir = self.upload_dir / INCOMING_DIR
+            incoming_dir.mkdir(exist_ok=True)
+            incoming_path = incoming_dir / f"{uuid.uuid4()}.part"
+            file_size = 0
+            hasher = hashlib.sha256()
+            async with aiofiles.open(incoming_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > MAX_FILE_SIZE:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File too large. Maximum size is {MAX_FILE_SIZE / 1024 / 1024}MB"
+                        )
+                    hasher.update(chunk)
+                    await f.write(chunk)
             
-            # Save file
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                
-                # Check file size
-                if len(content) > MAX_FILE_SIZE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"File too large. Maximum size is {MAX_FILE_SIZE / 1024 / 1024}MB"
+            digest = hasher.hexdigest()
+            file_path = self.blob_path(digest, file.content_type)
+            claim = str(uuid.uuid4())
+            ref = await db.upload_refs.find_one_and_update(
+                {"_id": digest},
+                {
+                    "$inc": {"refs": 1},
+                    "$addToSet": {"subfolders": subfolder or ""},
+                    "$setOnInsert": {
+                        "path": self.key_for(file_path),
+                        "original_filename": file.filename,
+                        "file_size": file_size,
+                        "mime_type": file.content_type,
+                        "created_at": datetime.utcnow(),
+                        "status": "processing",
+                        "claim": claim,
+                        "claimed_at": datetime.utcnow()
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            
+            image_info = None
+            if ref.get("claim") != claim:
+                image_info = await self._wait_for_blob(digest, self.key_for(file_path), claim, db)
+            if image_info is None:
+                # This upload owns the blob: store and process it
+                try:
+                    image_info = await self._store_blob(incoming_path, file_path, file.content_type)
+                    await self._publish(file_path)
+                    await db.upload_refs.update_one(
+                        {"_id": digest},
+                        {"$set": {"image": image_info, "status": "ready"}, "$unset": {"claim": "", "claimed_at": ""}}
                     )
-                
-                await f.write(content)
+                except BaseException:
+                    # Let a waiting upload of the same bytes take over
+                    await db.upload_refs.update_one(
+                        {"_id": digest, "claim": claim}, {"$set": {"status": "failed"}}
+                    )
+                    await self._release(digest, db)
+                    raise
+            
+            url = self.url_for(file_path)
+            record = UploadedFile(
+                filename=file_path.name,
+                original_filename=file.filename,
+                path=self.key_for(file_path),
+                url=url,
+                file_size=file_size,
+                mime_type=file.content_type,
+                sha256=digest,
+                subfolder=subfolder or None,
+                width=image_info["width"],
+                height=image_info["height"]
+            )
+            try:
+                await db.uploads.insert_one(record.dict())
+            except BaseException:
+                await self._release(digest, db)
+                raise
             
-            # Optimize image if it's an image file
-            if file.content_type in ALLOWED_IMAGE_TYPES:
-                await self._optimize_image(file_path)
+            variants = [
+                {**variant, "url": self.url_for(file_path.with_name(variant["filename"]))}
+                for variant in image_info["variants"]
+            ]
             
             # Return file info
             return {
-                "filename": unique_filename,
+                "id": record.id,
+                "filename": file_path.name,
                 "original_filename": file.filename,
                 "file_path": str(file_path),
-                "file_size": len(content),
+                "file_size": file_size,
+                "sha256": digest,
                 "mime_type": file.content_type,
-                "url": f"/api/files/{subfolder}/{unique_filename}" if subfolder else f"/api/files/{unique_filename}"
+                "url": url,
+                "width": image_info["width"],
+                "height": image_info["height"],
+                "variants": variants,
+                "srcset": self._build_srcset(url, {**image_info, "variants": variants})
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
-            # Clean up file if something went wrong
-            if 'file_path' in locals() and file_path.exists():
-                file_path.unlink()
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+        finally:
+            # Clean up the staging file if it was not moved into place
+            if incoming_path is not None and incoming_path.exists():
+                incoming_path.unlink()
+    
+    async def _wait_for_blob(self, digest: str, key: str, claim: str, db) -> Optional[dict]:
+        """Image info of a blob another upload processed, or None once this
+        upload has claimed the processing itself."""
+        while True:
+            ref = await db.upload_refs.find_one({"_id": digest})
+            # Entries written before processing was tracked have no status
+            if ref.get("status", "ready") == "ready" and await self.storage.exists(key):
+                return ref.get("image") or dict(EMPTY_IMAGE_INFO)
+            
+            now = datetime.utcnow()
+            claimed = await db.upload_refs.update_one(
+                {
+                    "_id": digest,
+                    "$or": [
+                        {"status": {"$ne": "processing"}},
+                        {"claimed_at": {"$lt": now - BLOB_CLAIM_TIMEOUT}}
+                    ]
+                },
+                {"$set": {"status": "processing", "claim": claim, "claimed_at": now}}
+            )
+            if claimed.modified_count:
+                return None
+            await asyncio.sleep(BLOB_POLL_INTERVAL)
+    
+    async def _store_blob(self, incoming_path: Path, file_path: Path, mime_type: str) -> dict:
+        """Move a staged upload into place; optimize it and build variants."""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(incoming_path, file_path)
+        if mime_type in COMPRESSIBLE_TYPES:
+            try:
+                await self.run_image_job(precompress, str(file_path))
+            except HTTPException:
+                raise
+            except Exception as e:
+                print(f"Precompression failed: {e}")
+        if mime_type not in ALLOWED_IMAGE_TYPES:
+            return dict(EMPTY_IMAGE_INFO)
+        await self._optimize_image(file_path)
+        return await self._generate_variants(file_path)
+    
+    async def _publish(self, file_path: Path):
+        """Hand a processed blob and its derived files over to storage."""
+        family = [
+            path for path in file_path.parent.iterdir()
+            if path.name == file_path.name or path.name.startswith(f"{file_path.stem}{VARIANT_SEPARATOR}")
+            or path.name in (f"{file_path.name}.br", f"{file_path.name}.gz")
+        ]
+        # The blob goes last so `storage.exists` implies its variants are there
+        for path in sorted(family, key=lambda p: p == file_path):
+            await self.storage.store(self.key_for(path), path, cache_control=IMMUTABLE_CACHE_CONTROL)
+    
+    async def _release(self, digest: str, db) -> bool:
+        """Drop one reference to a blob, deleting it with the last one."""
+        ref = await db.upload_refs.find_one_and_update(
+            {"_id": digest, "refs": {"$gt": 0}},
+            {"$inc": {"refs": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if ref is None:
+            return False
+        if ref["refs"] <= 0:
+            # Guard on refs so a concurrent re-upload keeps the blob alive
+            result = await db.upload_refs.delete_one({"_id": digest, "refs": {"$lte": 0}})
+            if result.deleted_count:
+                await self.delete_stored(ref["path"])
+        return True
+    
+    async def delete_upload(self, filename: str, subfolder: Optional[str], db) -> bool:
+        """Delete an upload by name, dropping one catalog entry for it and
+        releasing content-addressed blobs.
+        
+        A blob is only released for a matching catalog entry, since other
+        entries may still point at it.
+        """
+        query = {"filename": filename}
+        if subfolder:
+            query["subfolder"] = subfolder
+        record = await db.uploads.find_one_and_delete(
+            query, projection=UPLOADED_FILE_PROJECTION, sort=[("created_at", -1)]
+        )
+        
+        match = CAS_FILENAME.fullmatch(filename)
+        if match:
+            return record is not None and await self._release(match.group(1), db)
+        if record is not None:
+            await self.delete_stored(record["path"])
+            return True
+        return await self.delete_stored(self.key_for(self.get_file_path(filename, subfolder)))
     
     async def _optimize_image(self, file_path: Path):
         """Optimize image file for web use."""
         try:
-            with Image.open(file_path) as img:
-                # Convert to RGB if necessary
-                if img.mode in ("RGBA", "P"):
-                    img = img.convert("RGB")
-                
-                # Resize if too large
-                max_dimension = 1920
-                if max(img.size) > max_dimension:
-                    img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
-                
-                # Save optimized image
-                img.save(file_path, optimize=True, quality=85)
+            await self.run_image_job(optimize_image, str(file_path))
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Image optimization failed: {e}")
             # Continue without optimization if it fails
     
-    def delete_file(self, file_path: str) -> bool:
-        """Delete a file."""
+    async def _generate_variants(self, file_path: Path) -> dict:
+        """Create the configured responsive variants of an image."""
         try:
-            full_path = Path(file_path)
-            if full_path.exists() and full_path.is_relative_to(self.upload_dir):
-                full_path.unlink()
-                return True
-            return False
+            return await self.run_image_job(
+                generate_variants, str(file_path), IMAGE_VARIANT_WIDTHS, IMAGE_VARIANT_FORMATS
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Image variant generation failed: {e}")
+            return dict(EMPTY_IMAGE_INFO)
+    
+    @staticmethod
+    def _build_srcset(url: str, image_info: dict) -> dict:
+        """Group variants into one `srcset` string per format."""
+        srcset = {}
+        for variant in sorted(image_info["variants"], key=lambda v: v["width"]):
+            srcset.setdefault(variant["format"], []).append(f"{variant['url']} {variant['width']}w")
+        if image_info["width"] and image_info["format"] in srcset:
+            # The optimized upload itself is the widest candidate of its format
+            srcset[image_info["format"]].append(f"{url} {image_info['width']}w")
+        return {fmt: ", ".join(entries) for fmt, entries in srcset.items()}
+    
+    async def delete_stored(self, key: str) -> bool:
+        """Delete a stored file with its responsive variants and precompressed siblings."""
+        try:
+            directory, _, name = key.rpartition("/")
+            stem = Path(name).stem
+            family = [
+                candidate for candidate in await self.storage.list(directory, stem)
+                if candidate == key or candidate in (f"{key}.br", f"{key}.gz")
+                or candidate.rpartition("/")[2].startswith(f"{stem}{VARIANT_SEPARATOR}")
+            ]
+            if key not in family:
+                return False
+            await self.storage.delete(family)
+            return True
         except Exception:
             return False
     
@@ -110,29 +526,142 @@ class FileUploadManager:
             return self.upload_dir / subfolder / filename
         return self.upload_dir / filename
     
-    def list_files(self, subfolder: Optional[str] = None) -> list:
-        """List all files in upload directory."""
-        try:
-            search_dir = self.upload_dir
-            if subfolder:
-                search_dir = search_dir / subfolder
-            
-            if not search_dir.exists():
-                return []
-            
-            files = []
-            for file_path in search_dir.iterdir():
-                if file_path.is_file():
-                    files.append({
-                        "filename": file_path.name,
-                        "size": file_path.stat().st_size,
-                        "modified": file_path.stat().st_mtime,
-                        "url": f"/api/files/{subfolder}/{file_path.name}" if subfolder else f"/api/files/{file_path.name}"
-                    })
-            
-            return sorted(files, key=lambda x: x["modified"], reverse=True)
-        except Exception:
-            return []
+    async def list_files(
+        self,
+        subfolder: Optional[str],
+        db,
+        mime_type: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> UploadedFilePage:
+        """Page through the upload catalog, newest first.
+        
+        `mime_type` is either an exact type ("application/pdf") or a
+        top-level one ("image") matching all of its subtypes.
+        """
+        query = {}
+        if subfolder:
+            query["subfolder"] = subfolder
+        if mime_type:
+            if "/" in mime_type:
+                query["mime_type"] = mime_type
+            else:
+                # Anchored prefix, so it is still an index range scan
+                query["mime_type"] = {"$regex": f"^{re.escape(mime_type)}/"}
+        items, next_cursor = await keyset_page(
+            db.uploads, query, UPLOADED_FILE_PROJECTION, "created_at", limit, cursor, UploadedFile
+        )
+        return UploadedFilePage(items=items, next_cursor=next_cursor)
+    
+    async def _scan_uploads(self) -> list:
+        """Keys of every original upload in storage."""
+        found = []
+        for key in await self.storage.walk():
+            relative = Path(key)
+            # Skip staging files, responsive variants and .br/.gz siblings
+            if (
+                any(part.startswith(".") for part in relative.parts)
+                or VARIANT_SEPARATOR in relative.name
+                or relative.suffix in (".br", ".gz")
+            ):
+                continue
+            found.append(key)
+        return found
+    
+    def _describe_file(self, relative: str, local_path: Path) -> dict:
+        """Build the catalog fields of a stored file from a local copy."""
+        file_path = self.upload_dir / relative
+        blob = CAS_FILENAME.fullmatch(file_path.name)
+        if blob:
+            # Images are optimized after upload, so a blob is named after the
+            # digest of the uploaded bytes, not of the bytes it now holds
+            sha256 = blob.group(1)
+        else:
+            hasher = hashlib.sha256()
+            with open(local_path, "rb") as f:
+                while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                    hasher.update(chunk)
+            sha256 = hasher.hexdigest()
+        
+        mime_type = (
+            MIME_TYPES.get(file_path.suffix.lower())
+            or mimetypes.guess_type(file_path.name)[0]
+            or "application/octet-stream"
+        )
+        width = height = None
+        if mime_type in ALLOWED_IMAGE_TYPES:
+            try:
+                with Image.open(local_path) as img:
+                    width, height = img.size
+            except (OSError, UnidentifiedImageError):
+                pass
+        
+        stat_result = local_path.stat()
+        parent = Path(relative).parent.as_posix()
+        is_blob = relative.startswith(f"{CAS_DIR}/")
+        return {
+            "filename": file_path.name,
+            "original_filename": file_path.name,
+            "path": relative,
+            "url": self.url_for(file_path),
+            "file_size": stat_result.st_size,
+            "mime_type": mime_type,
+            "sha256": sha256,
+            "subfolder": None if is_blob or parent == "." else parent,
+            "width": width,
+            "height": height,
+            "created_at": datetime.utcfromtimestamp(stat_result.st_mtime)
+        }
+    
+    async def reconcile(self, db, dry_run: bool = False) -> dict:
+        """Sync the `uploads` catalog with the files in storage.
+        
+        Catalog entries (and blob references) whose file is gone are
+        removed, and files without an entry are hashed and added.
+        """
+        stored = set(await self._scan_uploads())
+        cataloged = set()
+        async for record in db.uploads.find({}, {"_id": 0, "path": 1}):
+            cataloged.add(record["path"])
+        
+        missing = sorted(cataloged - stored)
+        untracked = sorted(stored - cataloged)
+        report = {"scanned": len(stored), "added": untracked, "removed": missing}
+        if dry_run:
+            return report
+        
+        if missing:
+            await db.uploads.delete_many({"path": {"$in": missing}})
+            await db.upload_refs.delete_many({"path": {"$in": missing}})
+        
+        for relative in untracked:
+            # Remote files are downloaded to a scratch copy to hash them
+            scratch = self.upload_dir / INCOMING_DIR / f"{uuid.uuid4()}.part"
+            try:
+                local_path = await self.storage.fetch(relative, scratch)
+                info = await asyncio.to_thread(self._describe_file, relative, local_path)
+            finally:
+                scratch.unlink(missing_ok=True)
+            record = UploadedFile(**info)
+            await db.uploads.insert_one(record.dict())
+            if CAS_FILENAME.fullmatch(record.filename):
+                # Blobs need a live reference for delete_upload to release
+                await db.upload_refs.update_one(
+                    {"_id": record.sha256},
+                    {
+                        "$max": {"refs": 1},
+                        "$setOnInsert": {
+                            "path": record.path,
+                            "original_filename": record.original_filename,
+                            "file_size": record.file_size,
+                            "mime_type": record.mime_type,
+                            "created_at": record.created_at,
+                            "status": "ready"
+                        }
+                    },
+                    upsert=True
+                )
+        return report
 
 # Global instance
 file_manager = FileUploadManager()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import os
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.requests import Request
+from starlette.responses import Response
+from compression import COMPRESSION_MIN_SIZE, SNAPSHOT_LEVELS, compress, encoded_etag, negotiate_encoding
+
+# Revalidate on every use by default so admins never see a stale section;
+# override per section with e.g. CACHE_CONTROL_BLOG="public, max-age=300"
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+
+@dataclass
+class RenderedSection:
+    """A public section serialized once, with its validators."""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+    # Compressed bodies by content coding, filled on first request; the
+    # section cache keeps them for as long as the identity body
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def encode(self, encoding: Optional[str]) -> Optional[bytes]:
+        """Body compressed with `encoding`, or None to send the identity body."""
+        if encoding is None or len(self.body) < COMPRESSION_MIN_SIZE:
+            return None
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(self.body, encoding, SNAPSHOT_LEVELS[encoding])
+        return self.encoded[encoding]
+
+
+def cache_control_for(section: str) -> str:
+    """Cache-Control header value configured for a section."""
+    default = os.getenv("CACHE_CONTROL_DEFAULT", DEFAULT_CACHE_CONTROL)
+    return os.getenv(f"CACHE_CONTROL_{section.upper()}", default)
+
+
+def _latest_update(data: Any) -> Optional[datetime]:
+    """Most recent `updated_at` found in a model or list of models."""
+    if isinstance(data, (list, tuple)):
+        # Lists of plain values (tags, technologies) hold no timestamps
+        if not data or not isinstance(data[0], (list, tuple, BaseModel)):
+            return None
+        candidates = [_latest_update(item) for item in data]
+    elif isinstance(data, BaseModel):
+        candidates = [getattr(data, "updated_at", None)]
+        candidates += [
+            _latest_update(value)
+            for value in data.__dict__.values()
+            if isinstance(value, (list, tuple, BaseModel))
+        ]
+    else:
+        return None
+    candidates = [c for c in candidates if isinstance(c, datetime)]
+    return max(candidates) if candidates else None
+
+
+def serialize(data: Any) -> bytes:
+    """Compact UTF-8 JSON of models that were already validated on load.
+    
+    pydantic-core writes the bytes straight from the model instances, so the
+    schema is the one the route declares without a response_model pass.
+    """
+    return to_json(data)
+
+
+def render_section(data: Any) -> RenderedSection:
+    """Serialize a section and derive a strong ETag from its content."""
+    body = serialize(data)
+    last_modified = _latest_update(data)
+    stamp = int(last_modified.replace(tzinfo=timezone.utc).timestamp()) if last_modified else 0
+    digest = hashlib.sha256(body).hexdigest()[:24]
+    return RenderedSection(
+        body=body,
+        etag=f'"{stamp:x}-{digest}"',
+        last_modified=last_modified
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_response(request: Request, rendered: RenderedSection, cache_control: str) -> Response:
+    """Return 304 when the client already has this version, else the body.
+    
+    The body is sent precompressed when the client accepts br or gzip.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    body = rendered.encode(encoding)
+    headers = {"ETag": rendered.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if body is None:
+        body = rendered.body
+    else:
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = encoded_etag(rendered.etag, encoding)
+    if rendered.last_modified:
+        headers["Last-Modified"] = format_datetime(
+            rendered.last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
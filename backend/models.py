@@ -1,8 +1,16 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 import uuid
 
+def projection(model) -> Dict[str, int]:
+    """Mongo projection selecting a model's fields, without Mongo's `_id`.
+    
+    Queries pass the projection of the model they build, so fields a view
+    does not use never leave the database.
+    """
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
 # Base Models
 class BaseDocument(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -15,6 +23,7 @@ class User(BaseDocument):
     password: str  # This will be hashed
     name: str
     role: str = "admin"
+USER_PROJECTION = projection(User)
 
 class LoginRequest(BaseModel):
     email: str
@@ -22,9 +31,40 @@ class LoginRequest(BaseModel):
 
 class LoginResponse(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int  # access token lifetime in seconds
     user: Dict[str, Any]
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class TokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+class AuthSession(BaseDocument):
+    """A login session; only a hash of its current refresh token is stored."""
+    user_id: str
+    token_hash: str
+    previous_token_hash: Optional[str] = None
+    # Tokens handed to concurrent refreshes of the previous token
+    grace_token_hashes: List[str] = []
+    rotated_at: Optional[datetime] = None
+    expires_at: datetime
+    revoked_at: Optional[datetime] = None
+AUTH_SESSION_PROJECTION = projection(AuthSession)
+
+class AuthenticatedUser(BaseModel):
+    """The caller, as described by the claims of their access token."""
+    id: str
+    session_id: str
+    email: str
+    name: str
+    role: str
+
 # Hero Section Models
 class SocialLinks(BaseModel):
     linkedin: Optional[str] = None
@@ -41,6 +81,7 @@ class HeroSection(BaseModel):
     resume_url: Optional[str] = None
     social_links: SocialLinks = SocialLinks()
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+HERO_PROJECTION = projection(HeroSection)
 
 class HeroUpdate(BaseModel):
     name: Optional[str] = None
@@ -61,6 +102,7 @@ class AboutSection(BaseModel):
     projects_completed: int
     technologies: List[str] = []
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+ABOUT_PROJECTION = projection(AboutSection)
 
 class AboutUpdate(BaseModel):
     title: Optional[str] = None
@@ -80,6 +122,7 @@ class Education(BaseDocument):
     gpa: Optional[str] = None
     description: str
     order: int = 0
+EDUCATION_PROJECTION = projection(Education)
 
 class EducationCreate(BaseModel):
     degree: str
@@ -110,6 +153,7 @@ class Experience(BaseDocument):
     achievements: List[str] = []
     technologies: List[str] = []
     order: int = 0
+EXPERIENCE_PROJECTION = projection(Experience)
 
 class ExperienceCreate(BaseModel):
     position: str
@@ -144,6 +188,7 @@ class Skills(BaseModel):
     technical: List[TechnicalSkill] = []
     soft: List[str] = []
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+SKILLS_PROJECTION = projection(Skills)
 
 class TechnicalSkillCreate(BaseModel):
     name: str
@@ -171,6 +216,7 @@ class Project(BaseDocument):
     featured: bool = False
     category: str
     order: int = 0
+PROJECT_PROJECTION = projection(Project)
 
 class ProjectCreate(BaseModel):
     title: str
@@ -196,6 +242,11 @@ class ProjectUpdate(BaseModel):
     category: Optional[str] = None
     order: Optional[int] = None
 
+class ProjectCategory(BaseModel):
+    category: str
+    count: int
+    featured: int  # featured projects in the category
+
 # Certification Models
 class Certification(BaseDocument):
     name: str
@@ -205,6 +256,7 @@ class Certification(BaseDocument):
     image: Optional[str] = None
     url: Optional[str] = None
     order: int = 0
+CERTIFICATION_PROJECTION = projection(Certification)
 
 class CertificationCreate(BaseModel):
     name: str
@@ -233,6 +285,7 @@ class Testimonial(BaseDocument):
     quote: str
     rating: int = 5  # 1-5
     order: int = 0
+TESTIMONIAL_PROJECTION = projection(Testimonial)
 
 class TestimonialCreate(BaseModel):
     name: str
@@ -263,6 +316,23 @@ class BlogArticle(BaseDocument):
     image: Optional[str] = None
     featured: bool = False
     published: bool = True
+BLOG_ARTICLE_PROJECTION = projection(BlogArticle)
+
+class BlogArticleSummary(BaseDocument):
+    """List view of an article; the full `content` is fetched separately."""
+    title: str
+    excerpt: str
+    publish_date: datetime
+    read_time: str
+    tags: List[str] = []
+    image: Optional[str] = None
+    featured: bool = False
+    published: bool = True
+BLOG_ARTICLE_SUMMARY_PROJECTION = projection(BlogArticleSummary)
+
+class BlogArticlePage(BaseModel):
+    items: List[BlogArticleSummary]
+    next_cursor: Optional[str] = None
 
 class BlogArticleCreate(BaseModel):
     title: str
@@ -324,6 +394,7 @@ class SiteSettings(BaseModel):
         "contact": SectionSettings(order=10)
     }
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+SETTINGS_PROJECTION = projection(SiteSettings)
 
 class SiteSettingsUpdate(BaseModel):
     theme: Optional[str] = None
@@ -337,6 +408,22 @@ class SiteSettingsUpdate(BaseModel):
     blog_enabled: Optional[bool] = None
     sections: Optional[Dict[str, SectionSettings]] = None
 
+# Aggregated Portfolio Models
+class PortfolioSnapshot(BaseModel):
+    hero: HeroSection
+    about: AboutSection
+    education: List[Education] = []
+    experience: List[Experience] = []
+    skills: Skills
+    projects: List[Project] = []
+    certifications: List[Certification] = []
+    testimonials: List[Testimonial] = []
+    # First page of /portfolio/blog; the rest is reached from blog_next_cursor
+    blog: List[BlogArticleSummary] = []
+    blog_next_cursor: Optional[str] = None
+    blog_count: int = 0
+    settings: SiteSettings
+
 # Contact Form Models
 class ContactMessage(BaseDocument):
     name: str
@@ -344,6 +431,7 @@ class ContactMessage(BaseDocument):
     subject: str
     message: str
     read: bool = False
+CONTACT_MESSAGE_PROJECTION = projection(ContactMessage)
 
 class ContactMessageCreate(BaseModel):
     name: str
@@ -351,14 +439,68 @@ class ContactMessageCreate(BaseModel):
     subject: str
     message: str
 
+class ContactMessagePage(BaseModel):
+    items: List[ContactMessage]
+    next_cursor: Optional[str] = None
+
+class ContactMessageCounts(BaseModel):
+    total: int
+    unread: int
+    read: int
+
+class ContactMessageMarkRead(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+    read: bool = True
+
 # File Upload Models
-class UploadedFile(BaseModel):
+class UploadedFile(BaseDocument):
+    """Catalog entry for one upload, stored in the `uploads` collection."""
     filename: str
     original_filename: str
-    file_path: str
+    path: str  # relative to the upload directory
+    url: str
     file_size: int
     mime_type: str
-    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+    sha256: str
+    subfolder: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+UPLOADED_FILE_PROJECTION = projection(UploadedFile)
+
+class UploadedFilePage(BaseModel):
+    items: List[UploadedFile]
+    next_cursor: Optional[str] = None
+
+# Batch Models
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None  # required for update and delete
+    data: Optional[Dict[str, Any]] = None  # create/update payload of the collection
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=500)
+
+class BatchResult(BaseModel):
+    created: List[str] = []  # ids of created documents, in request order
+    updated: int = 0
+    deleted: int = 0
+
+class OrderRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+# Search Models
+class SearchResult(BaseModel):
+    type: Literal["blog", "project"]
+    id: str
+    title: str
+    summary: str  # article excerpt or project description
+    tags: List[str] = []  # article tags or project technologies
+    image: Optional[str] = None
+    score: float
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchResult]
 
 # Response Models
 class MessageResponse(BaseModel):
@@ -0,0 +1,63 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(sort_value: datetime, doc_id: str) -> str:
+    """Opaque cursor pointing just after a document in (sort_value, id) order."""
+    raw = json.dumps([sort_value.isoformat(), doc_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), str(doc_id)
+    except (binascii.Error, TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(field: str, cursor: str, descending: bool = True) -> dict:
+    """Mongo filter selecting documents after the cursor position.
+
+    Expects the query to be sorted on (field, id) in the given direction,
+    which keeps every page an index range scan instead of a skip.
+    """
+    sort_value, doc_id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {field: {op: sort_value}},
+            {field: sort_value, "id": {op: doc_id}}
+        ]
+    }
+
+
+async def keyset_page(
+    collection, query: dict, projection: dict, field: str, limit: int,
+    cursor: Optional[str], model, descending: bool = True
+) -> Tuple[List, Optional[str]]:
+    """One page of `model` items sorted on (field, id), and the cursor after it.
+
+    Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        query = {**query, **keyset_filter(field, cursor, descending)}
+    direction = -1 if descending else 1
+    # Fetch one extra row to know whether another page follows
+    docs = await collection.find(query, projection).sort(
+        [(field, direction), ("id", direction)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+
+    items = [model(**doc) for doc in docs[:limit]]
+    next_cursor = None
+    if len(docs) > limit:
+        next_cursor = encode_cursor(getattr(items[-1], field), items[-1].id)
+    return items, next_cursor
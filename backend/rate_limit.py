@@ -0,0 +1,38 @@
+import time
+from typing import Dict, Tuple
+
+
+class TokenBucketLimiter:
+    """In-memory token buckets, one per key (e.g. client IP or account).
+
+    Each bucket holds up to `capacity` tokens and refills at `refill_rate`
+    tokens per second. Only the `max_keys` most recently seen keys are kept;
+    a forgotten key simply starts again with a full bucket.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, updated_at)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Take `cost` tokens; return 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / self.refill_rate
+
+        # Re-insert so dict order tracks recency for eviction
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            del self._buckets[next(iter(self._buckets))]
+        return retry_after
+
+    def reset(self, key: str):
+        self._buckets.pop(key, None)
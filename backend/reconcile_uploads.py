@@ -0,0 +1,41 @@
+"""Sync the `uploads` catalog with the files in upload storage.
+
+Usage: python reconcile_uploads.py [--dry-run]
+"""
+import asyncio
+import os
+from pathlib import Path
+import typer
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from file_upload import file_manager
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+async def run(dry_run: bool) -> dict:
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ.get('DB_NAME', 'portfolio')]
+    try:
+        return await file_manager.reconcile(db, dry_run=dry_run)
+    finally:
+        client.close()
+
+
+def main(dry_run: bool = typer.Option(False, "--dry-run", help="Report differences without changing the catalog")):
+    """Add catalog entries for untracked files and drop entries whose file is gone."""
+    report = asyncio.run(run(dry_run))
+    for path in report["added"]:
+        typer.echo(f"+ {path}")
+    for path in report["removed"]:
+        typer.echo(f"- {path}")
+    verb = ("Would add", "remove") if dry_run else ("Added", "removed")
+    typer.echo(
+        f"{verb[0]} {len(report['added'])} and {verb[1]} {len(report['removed'])} "
+        f"catalog entries ({report['scanned']} files in storage)"
+    )
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,20 +1,27 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request, Query
 from fastapi.responses import FileResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from starlette.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from pathlib import Path
 import os
+import math
+import time
+import asyncio
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 # Import our modules
 from models import *
-from database import Database
+from database import Database, FILTERED_PROJECTS, LIST_COLLECTIONS
 from auth import *
-from file_upload import file_manager
+from file_upload import file_manager, UPLOAD_DIR
+from static_files import UploadStaticFiles, DerivativeCache, DERIVATIVE_CACHE_DIR, DERIVATIVE_CACHE_MAX_BYTES
+from compression import CompressionMiddleware
+from http_cache import cache_control_for, conditional_response, render_section
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from rate_limit import TokenBucketLimiter
 
 # Load environment
 ROOT_DIR = Path(__file__).parent
@@ -23,7 +30,32 @@ load_dotenv(ROOT_DIR / '.env')
 # Database setup
 mongo_url = os.environ['MONGO_URL']
 db_name = os.environ.get('DB_NAME', 'portfolio')
-database = Database(mongo_url, db_name)
+cache_ttl = float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+cache_version_check = float(os.environ.get('CACHE_VERSION_CHECK_SECONDS', '1'))
+# Longest time a change to a user record can go unnoticed by /auth/refresh
+user_cache_ttl = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+user_cache_size = int(os.environ.get('USER_CACHE_SIZE', '128'))
+cache_variants = int(os.environ.get('CACHE_MAX_VARIANTS', '64'))
+database = Database(
+    mongo_url,
+    db_name,
+    cache_ttl=cache_ttl,
+    version_check_interval=cache_version_check,
+    user_cache_ttl=user_cache_ttl,
+    user_cache_size=user_cache_size,
+    cache_variants=cache_variants
+)
+
+# Login throttling: token buckets per client IP and per account (email).
+# Run uvicorn with --proxy-headers behind a proxy so the client IP is real.
+login_ip_limiter = TokenBucketLimiter(
+    capacity=float(os.environ.get('LOGIN_IP_BURST', '10')),
+    refill_rate=float(os.environ.get('LOGIN_IP_PER_MINUTE', '10')) / 60
+)
+login_account_limiter = TokenBucketLimiter(
+    capacity=float(os.environ.get('LOGIN_ACCOUNT_BURST', '5')),
+    refill_rate=float(os.environ.get('LOGIN_ACCOUNT_PER_MINUTE', '5')) / 60
+)
 
 # Create the main app
 app = FastAPI(title="Portfolio API", version="1.0.0")
@@ -40,30 +72,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve uploaded files
-app.mount("/api/files", StaticFiles(directory="/app/backend/uploads"), name="files")
+# br/gzip for responses of at least COMPRESSION_MIN_SIZE bytes; public
+# sections arrive already compressed from their cached snapshot
+app.add_middleware(CompressionMiddleware)
+
+# Serve uploaded files, with on-demand resized derivatives (?w=&h=&fmt=)
+derivative_cache = DerivativeCache(DERIVATIVE_CACHE_DIR, DERIVATIVE_CACHE_MAX_BYTES)
+app.mount(
+    "/api/files",
+    UploadStaticFiles(directory=str(UPLOAD_DIR), derivative_cache=derivative_cache),
+    name="files"
+)
 
 # Dependency to get database
 async def get_db():
     return database.db
 
-# Dependency to get current user with database
+# Sessions revoked by any worker, synced in the background (see startup)
+revocation_list = RevocationList()
+
+# Dependency to get the current user. Access tokens carry the user's claims
+# and session, so authorization is a signature check plus a set lookup.
 async def get_current_user_with_db(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     payload = verify_token(credentials.credentials)
-    user_id = payload.get("sub")
-    
-    user_data = await db.users.find_one({"id": user_id})
-    if user_data is None:
+    session_id = payload.get("sid")
+    if session_id is None or session_id in revocation_list:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return User(**user_data)
+    return AuthenticatedUser(
+        id=payload["sub"],
+        session_id=session_id,
+        email=payload.get("email", ""),
+        name=payload.get("name", ""),
+        role=payload.get("role", "")
+    )
+
+def issue_access_token(user: User, session_id: str) -> str:
+    return create_access_token(
+        data=access_token_claims(user, session_id),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
 
 # Public endpoints (no authentication required)
 @api_router.get("/")
@@ -72,7 +126,20 @@ async def root():
 
 # Authentication endpoints
 @api_router.post("/auth/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest, db = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db = Depends(get_db)):
+    # Throttle before doing any bcrypt work
+    account = login_data.email.strip().lower()
+    retry_after = max(
+        login_ip_limiter.acquire(request.client.host if request.client else "unknown"),
+        login_account_limiter.acquire(account)
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    
     user = await authenticate_user(login_data.email, login_data.password, db)
     if not user:
         raise HTTPException(
@@ -80,14 +147,17 @@ async def login(login_data: LoginRequest, db = Depends(get_db)):
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    login_account_limiter.reset(account)
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
+    refresh_token, token_hash = create_refresh_token()
+    session = await database.create_session(
+        user.id, token_hash, datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     )
     
     return LoginResponse(
-        access_token=access_token,
+        access_token=issue_access_token(user, session.id),
+        refresh_token=refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         user={
             "id": user.id,
             "email": user.email,
@@ -96,8 +166,37 @@ async def login(login_data: LoginRequest, db = Depends(get_db)):
         }
     )
 
+@api_router.post("/auth/refresh", response_model=TokenResponse)
+async def refresh_access_token(refresh_data: RefreshRequest):
+    # Refresh tokens are single use: each refresh rotates it
+    refresh_token, token_hash = create_refresh_token()
+    session = await database.rotate_session(
+        hash_refresh_token(refresh_data.refresh_token),
+        token_hash,
+        grace=timedelta(seconds=REFRESH_REUSE_GRACE_SECONDS)
+    )
+    user = await database.get_user(session.user_id) if session else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return TokenResponse(
+        access_token=issue_access_token(user, session.id),
+        refresh_token=refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+@api_router.post("/auth/logout", response_model=MessageResponse)
+async def logout(current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    await database.revoke_session(current_user.session_id)
+    revocation_list.add(current_user.session_id)
+    return MessageResponse(message="Logged out successfully")
+
 @api_router.get("/auth/me")
-async def get_current_user_info(current_user: User = Depends(get_current_user_with_db)):
+async def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return {
         "id": current_user.id,
         "email": current_user.email,
@@ -105,46 +204,107 @@ async def get_current_user_info(current_user: User = Depends(get_current_user_wi
         "role": current_user.role
     }
 
-# Public portfolio data endpoints (no auth required)
+# Public portfolio data endpoints (no auth required).
+# Bodies are rendered once per cached section and served with an ETag,
+# so revalidations are answered with 304 without touching the models.
+async def cached_section(request: Request, section: str, collection: str, loader, key: str = "rendered"):
+    rendered = await database.get_rendered(collection, loader, key)
+    return conditional_response(request, rendered, cache_control_for(section))
+
+@api_router.get("/portfolio", response_model=PortfolioSnapshot)
+async def get_portfolio(request: Request):
+    return await cached_section(request, "portfolio", "portfolio", database.get_portfolio)
+
 @api_router.get("/portfolio/hero", response_model=HeroSection)
-async def get_hero():
-    return await database.get_hero()
+async def get_hero(request: Request):
+    return await cached_section(request, "hero", "hero", database.get_hero)
 
 @api_router.get("/portfolio/about", response_model=AboutSection)
-async def get_about():
-    return await database.get_about()
+async def get_about(request: Request):
+    return await cached_section(request, "about", "about", database.get_about)
 
 @api_router.get("/portfolio/education", response_model=List[Education])
-async def get_education():
-    return await database.get_education()
+async def get_education(request: Request):
+    return await cached_section(request, "education", "education", database.get_education)
 
 @api_router.get("/portfolio/experience", response_model=List[Experience])
-async def get_experience():
-    return await database.get_experience()
+async def get_experience(request: Request):
+    return await cached_section(request, "experience", "experience", database.get_experience)
 
 @api_router.get("/portfolio/skills", response_model=Skills)
-async def get_skills():
-    return await database.get_skills()
+async def get_skills(request: Request):
+    return await cached_section(request, "skills", "skills", database.get_skills)
 
 @api_router.get("/portfolio/projects", response_model=List[Project])
-async def get_projects():
-    return await database.get_projects()
+async def get_projects(
+    request: Request,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    technology: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    filters = {"category": category, "featured": featured, "technology": technology, "limit": limit}
+    if all(value is None for value in filters.values()):
+        return await cached_section(request, "projects", "projects", database.get_projects)
+    key = "rendered:" + ":".join(f"{k}={v}" for k, v in filters.items() if v is not None)
+    return await cached_section(
+        request, "projects", FILTERED_PROJECTS, lambda: database.get_projects(**filters), key
+    )
+
+@api_router.get("/portfolio/projects/categories", response_model=List[ProjectCategory])
+async def get_project_categories(request: Request):
+    return await cached_section(
+        request, "projects", "projects", database.get_project_categories, "rendered:categories"
+    )
 
 @api_router.get("/portfolio/certifications", response_model=List[Certification])
-async def get_certifications():
-    return await database.get_certifications()
+async def get_certifications(request: Request):
+    return await cached_section(request, "certifications", "certifications", database.get_certifications)
 
 @api_router.get("/portfolio/testimonials", response_model=List[Testimonial])
-async def get_testimonials():
-    return await database.get_testimonials()
+async def get_testimonials(request: Request):
+    return await cached_section(request, "testimonials", "testimonials", database.get_testimonials)
+
+@api_router.get("/portfolio/blog", response_model=BlogArticlePage)
+async def get_blog_articles(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    if cursor:
+        try:
+            page = await database.get_blog_articles(limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Later pages are not cached but still skip the response_model pass
+        return conditional_response(request, render_section(page), cache_control_for("blog"))
+    return await cached_section(
+        request, "blog", "blog_articles",
+        lambda: database.get_blog_articles(limit), f"rendered:page:{limit}"
+    )
 
-@api_router.get("/portfolio/blog", response_model=List[BlogArticle])
-async def get_blog_articles():
-    return await database.get_blog_articles()
+@api_router.get("/portfolio/blog/{article_id}", response_model=BlogArticle)
+async def get_blog_article(request: Request, article_id: str):
+    try:
+        return await cached_section(
+            request, "blog", "blog_articles",
+            lambda: database.get_blog_article(article_id), f"rendered:article:{article_id}"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.get("/portfolio/settings", response_model=SiteSettings)
-async def get_settings():
-    return await database.get_settings()
+async def get_settings(request: Request):
+    return await cached_section(request, "settings", "settings", database.get_settings)
+
+@api_router.get("/portfolio/search", response_model=SearchResults)
+async def search_portfolio(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50)
+):
+    results = SearchResults(query=q, results=await database.search(q, limit))
+    return conditional_response(request, render_section(results), cache_control_for("search"))
 
 # Contact form (public)
 @api_router.post("/contact", response_model=MessageResponse)
@@ -159,28 +319,51 @@ async def create_contact_message(message_data: ContactMessageCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 # Admin endpoints (authentication required)
+
+# Generic list collection endpoints; registered ahead of the per-item routes so
+# `/admin/projects/order` is not taken for a project id
+def list_collection(collection: str) -> str:
+    if collection not in LIST_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {collection}")
+    return collection
+
+@api_router.post("/admin/{collection}/batch", response_model=BatchResult)
+async def batch_collection(batch: BatchRequest, collection: str = Depends(list_collection), current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    try:
+        return await database.batch_write(collection, batch.operations)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@api_router.put("/admin/{collection}/order", response_model=MessageResponse)
+async def reorder_collection(order: OrderRequest, collection: str = Depends(list_collection), current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    try:
+        matched = await database.reorder(collection, order.ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MessageResponse(message=f"Reordered {matched} of {len(order.ids)} items", data={"matched": matched})
+
 @api_router.put("/admin/hero", response_model=HeroSection)
-async def update_hero(hero_data: HeroUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_hero(hero_data: HeroUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.update_hero(hero_data)
 
 @api_router.put("/admin/about", response_model=AboutSection)
-async def update_about(about_data: AboutUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_about(about_data: AboutUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.update_about(about_data)
 
 # Education admin endpoints
 @api_router.post("/admin/education", response_model=Education)
-async def create_education(education_data: EducationCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_education(education_data: EducationCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_education(education_data)
 
 @api_router.put("/admin/education/{edu_id}", response_model=Education)
-async def update_education(edu_id: str, education_data: EducationUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_education(edu_id: str, education_data: EducationUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_education(edu_id, education_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/education/{edu_id}", response_model=MessageResponse)
-async def delete_education(edu_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_education(edu_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_education(edu_id)
     if not success:
         raise HTTPException(status_code=404, detail="Education entry not found")
@@ -188,18 +371,18 @@ async def delete_education(edu_id: str, current_user: User = Depends(get_current
 
 # Experience admin endpoints
 @api_router.post("/admin/experience", response_model=Experience)
-async def create_experience(experience_data: ExperienceCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_experience(experience_data: ExperienceCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_experience(experience_data)
 
 @api_router.put("/admin/experience/{exp_id}", response_model=Experience)
-async def update_experience(exp_id: str, experience_data: ExperienceUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_experience(exp_id: str, experience_data: ExperienceUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_experience(exp_id, experience_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/experience/{exp_id}", response_model=MessageResponse)
-async def delete_experience(exp_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_experience(exp_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_experience(exp_id)
     if not success:
         raise HTTPException(status_code=404, detail="Experience entry not found")
@@ -207,23 +390,23 @@ async def delete_experience(exp_id: str, current_user: User = Depends(get_curren
 
 # Skills admin endpoints
 @api_router.put("/admin/skills", response_model=Skills)
-async def update_skills(skills_data: SkillsUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_skills(skills_data: SkillsUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.update_skills(skills_data)
 
 # Projects admin endpoints
 @api_router.post("/admin/projects", response_model=Project)
-async def create_project(project_data: ProjectCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_project(project_data: ProjectCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_project(project_data)
 
 @api_router.put("/admin/projects/{proj_id}", response_model=Project)
-async def update_project(proj_id: str, project_data: ProjectUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_project(proj_id: str, project_data: ProjectUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_project(proj_id, project_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/projects/{proj_id}", response_model=MessageResponse)
-async def delete_project(proj_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_project(proj_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_project(proj_id)
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -231,18 +414,18 @@ async def delete_project(proj_id: str, current_user: User = Depends(get_current_
 
 # Certifications admin endpoints
 @api_router.post("/admin/certifications", response_model=Certification)
-async def create_certification(cert_data: CertificationCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_certification(cert_data: CertificationCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_certification(cert_data)
 
 @api_router.put("/admin/certifications/{cert_id}", response_model=Certification)
-async def update_certification(cert_id: str, cert_data: CertificationUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_certification(cert_id: str, cert_data: CertificationUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_certification(cert_id, cert_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/certifications/{cert_id}", response_model=MessageResponse)
-async def delete_certification(cert_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_certification(cert_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_certification(cert_id)
     if not success:
         raise HTTPException(status_code=404, detail="Certification not found")
@@ -250,18 +433,18 @@ async def delete_certification(cert_id: str, current_user: User = Depends(get_cu
 
 # Testimonials admin endpoints
 @api_router.post("/admin/testimonials", response_model=Testimonial)
-async def create_testimonial(testimonial_data: TestimonialCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_testimonial(testimonial_data: TestimonialCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_testimonial(testimonial_data)
 
 @api_router.put("/admin/testimonials/{test_id}", response_model=Testimonial)
-async def update_testimonial(test_id: str, testimonial_data: TestimonialUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_testimonial(test_id: str, testimonial_data: TestimonialUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_testimonial(test_id, testimonial_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/testimonials/{test_id}", response_model=MessageResponse)
-async def delete_testimonial(test_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_testimonial(test_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_testimonial(test_id)
     if not success:
         raise HTTPException(status_code=404, detail="Testimonial not found")
@@ -269,18 +452,18 @@ async def delete_testimonial(test_id: str, current_user: User = Depends(get_curr
 
 # Blog admin endpoints
 @api_router.post("/admin/blog/articles", response_model=BlogArticle)
-async def create_blog_article(article_data: BlogArticleCreate, current_user: User = Depends(get_current_user_with_db)):
+async def create_blog_article(article_data: BlogArticleCreate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.create_blog_article(article_data)
 
 @api_router.put("/admin/blog/articles/{article_id}", response_model=BlogArticle)
-async def update_blog_article(article_id: str, article_data: BlogArticleUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_blog_article(article_id: str, article_data: BlogArticleUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     try:
         return await database.update_blog_article(article_id, article_data)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 @api_router.delete("/admin/blog/articles/{article_id}", response_model=MessageResponse)
-async def delete_blog_article(article_id: str, current_user: User = Depends(get_current_user_with_db)):
+async def delete_blog_article(article_id: str, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     success = await database.delete_blog_article(article_id)
     if not success:
         raise HTTPException(status_code=404, detail="Blog article not found")
@@ -288,7 +471,7 @@ async def delete_blog_article(article_id: str, current_user: User = Depends(get_
 
 # Settings admin endpoints
 @api_router.put("/admin/settings", response_model=SiteSettings)
-async def update_settings(settings_data: SiteSettingsUpdate, current_user: User = Depends(get_current_user_with_db)):
+async def update_settings(settings_data: SiteSettingsUpdate, current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
     return await database.update_settings(settings_data)
 
 # File upload endpoints
@@ -296,47 +479,117 @@ async def update_settings(settings_data: SiteSettingsUpdate, current_user: User
 async def upload_file(
     file: UploadFile = File(...),
     subfolder: Optional[str] = Form(None),
-    current_user: User = Depends(get_current_user_with_db)
+    current_user: AuthenticatedUser = Depends(get_current_user_with_db)
 ):
-    return await file_manager.save_file(file, subfolder)
+    return await file_manager.save_file(file, subfolder, database.db)
 
-@api_router.get("/admin/files", response_model=List[dict])
+@api_router.get("/admin/files", response_model=UploadedFilePage)
 async def list_files(
     subfolder: Optional[str] = None,
-    current_user: User = Depends(get_current_user_with_db)
+    mime_type: Optional[str] = Query(None, alias="type", description="Exact mime type or a top-level type such as 'image'"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user_with_db)
 ):
-    return file_manager.list_files(subfolder)
+    try:
+        return await file_manager.list_files(subfolder, database.db, mime_type=mime_type, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.delete("/admin/files/{filename}", response_model=MessageResponse)
 async def delete_file(
     filename: str,
     subfolder: Optional[str] = None,
-    current_user: User = Depends(get_current_user_with_db)
+    current_user: AuthenticatedUser = Depends(get_current_user_with_db)
 ):
-    file_path = file_manager.get_file_path(filename, subfolder)
-    success = file_manager.delete_file(str(file_path))
+    success = await file_manager.delete_upload(filename, subfolder, database.db)
     if not success:
         raise HTTPException(status_code=404, detail="File not found")
     return MessageResponse(message="File deleted successfully")
 
-# Contact messages admin endpoint
-@api_router.get("/admin/contact-messages", response_model=List[ContactMessage])
-async def get_contact_messages(current_user: User = Depends(get_current_user_with_db)):
-    return await database.get_contact_messages()
+# Contact messages admin endpoints
+@api_router.get("/admin/contact-messages", response_model=ContactMessagePage)
+async def get_contact_messages(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    read: Optional[bool] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user_with_db)
+):
+    try:
+        return await database.get_contact_messages(limit, cursor, read)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@api_router.get("/admin/contact-messages/count", response_model=ContactMessageCounts)
+async def count_contact_messages(current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    return await database.count_contact_messages()
+
+@api_router.post("/admin/contact-messages/mark-read", response_model=MessageResponse)
+async def mark_contact_messages(
+    mark_data: ContactMessageMarkRead,
+    current_user: AuthenticatedUser = Depends(get_current_user_with_db)
+):
+    modified = await database.mark_contact_messages(mark_data.ids, mark_data.read)
+    return MessageResponse(message="Messages updated successfully", data={"modified": modified})
+
+# Cache admin endpoints
+@api_router.get("/admin/cache/stats", response_model=dict)
+async def get_cache_stats(current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    return {
+        **database.cache.stats(),
+        "users": database.user_cache.stats(),
+        "derivatives": derivative_cache.stats()
+    }
+
+@api_router.post("/admin/cache/clear", response_model=MessageResponse)
+async def clear_cache(current_user: AuthenticatedUser = Depends(get_current_user_with_db)):
+    await database.clear_cache()
+    return MessageResponse(message="Cache cleared successfully")
 
 # Include the router in the main app
 app.include_router(api_router)
 
+async def sync_revocations():
+    """Reload recently revoked sessions every REVOCATION_SYNC_SECONDS."""
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await load_revocations()
+        except Exception as e:
+            # Keep the last snapshot; local revocations still apply
+            logger.warning(f"Revocation sync failed: {e}")
+
+async def load_revocations():
+    started_at = time.monotonic()
+    # Older revocations only concern access tokens that have expired anyway
+    since = datetime.utcnow() - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES, seconds=REVOCATION_SYNC_SECONDS)
+    revocation_list.replace(await database.get_revoked_sessions(since), started_at)
+
+revocation_task: Optional[asyncio.Task] = None
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    global revocation_task
     # Create default admin user
     await create_default_admin(database.db)
+    
+    # Make sure every query in database.py is backed by an index
+    created_indexes = await database.ensure_indexes()
+    if created_indexes:
+        print(f"✅ Created indexes: {', '.join(created_indexes)}")
+    
+    await load_revocations()
+    revocation_task = asyncio.create_task(sync_revocations())
     print("🚀 Portfolio API started successfully!")
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
+    if revocation_task is not None:
+        revocation_task.cancel()
+    file_manager.shutdown()
+    shutdown_password_pool()
     await database.close()
 
 # Configure logging
@@ -0,0 +1,354 @@
+import os
+import re
+import asyncio
+import hashlib
+import mimetypes
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import anyio
+from starlette.datastructures import Headers, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, PlainTextResponse, RedirectResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+from compression import accepted_encodings, accepts, skip_compression
+from file_upload import (
+    COMPRESSIBLE_TYPES, IMAGE_VARIANT_WIDTHS, INCOMING_DIR, VARIANT_ENCODERS, file_manager, render_derivative
+)
+from storage import IMMUTABLE_CACHE_CONTROL
+
+# On-demand derivatives (`?w=&h=&fmt=`) are cached on disk, evicting the
+# least recently used files once the total size passes the limit.
+DERIVATIVE_CACHE_DIR = Path(os.getenv("DERIVATIVE_CACHE_DIR", "/app/backend/cache/derivatives"))
+DERIVATIVE_CACHE_MAX_BYTES = int(os.getenv("DERIVATIVE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+MAX_DERIVATIVE_DIMENSION = 4096
+# Requested w/h are rounded up to one of these sizes (larger requests get the
+# largest), bounding how many derivatives a source can have
+DERIVATIVE_SIZES = sorted({
+    int(size) for size in os.getenv("DERIVATIVE_SIZES", "").split(",") if size.strip()
+} or {160, *IMAGE_VARIANT_WIDTHS})
+DERIVATIVE_SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+DERIVATIVE_PARAMS = ("w", "h", "fmt")
+
+# Content-addressed (sha256) and uuid-named uploads never change behind
+# their URL, so they (and their variants) can be cached forever
+IMMUTABLE_NAME = re.compile(
+    r"^(?:[0-9a-f]{64}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})(?:[@.]|$)"
+)
+FILES_CACHE_CONTROL = os.getenv("FILES_CACHE_CONTROL", "no-cache")
+PRECOMPRESSED_ENCODINGS = (("br", "br"), ("gzip", "gz"))  # preference order
+RANGE_HEADER = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class DerivativeCache:
+    """Size-bounded LRU of derivative files on disk.
+
+    Every worker keeps its own recency order, seeded from file access times
+    when first used; a file evicted by another worker is simply regenerated.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Path, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.loaded = False
+
+    def load(self):
+        """Index the derivatives already on disk, oldest access first."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.rglob("*"):
+            if path.is_file() and not path.name.endswith(".part"):
+                stat_result = path.stat()
+                files.append((stat_result.st_atime, path, stat_result.st_size))
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._total_bytes += size
+        self.loaded = True
+
+    def path_for(self, key: str, extension: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{extension}"
+
+    def get(self, path: Path) -> bool:
+        """Whether a derivative is cached, marking it as recently used."""
+        if not self.loaded:
+            self.load()
+        if path in self._entries:
+            if path.exists():
+                self._entries.move_to_end(path)
+                return True
+            self._total_bytes -= self._entries.pop(path)
+        return False
+
+    def add(self, path: Path):
+        size = path.stat().st_size
+        self._total_bytes += size - self._entries.pop(path, 0)
+        self._entries[path] = size
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted, evicted_size = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            evicted.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Resolve a single `bytes=` range to inclusive offsets.
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges, which are answered with the full body) and raises ValueError
+    when the range cannot be satisfied.
+    """
+    match = RANGE_HEADER.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class FileRangeResponse(Response):
+    """206 response streaming one byte range of a file."""
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, path: str, start: int, end: int, headers: Dict[str, str]):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.status_code = 206
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as f:
+            await f.seek(self.start)
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # File shrank underneath us; end the body cleanly
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+@skip_compression  # picks precompressed siblings itself and serves ranges
+class UploadStaticFiles(StaticFiles):
+    """Serves uploads, plus resized/re-encoded derivatives on request.
+
+    `/api/files/<path>?w=640&fmt=webp` fits the image inside the requested
+    box (never upscaling), encodes it once in the image process pool and
+    serves repeat requests straight from the derivative cache. Requested
+    sizes are rounded up to DERIVATIVE_SIZES.
+    
+    Responses carry long-lived immutable caching for hash/uuid names,
+    honour single byte ranges and prefer precompressed .br/.gz siblings
+    of compressible files when the client accepts them.
+    
+    With remote storage, plain requests redirect to a presigned URL of the
+    object and derivatives are rendered from a downloaded copy.
+    """
+
+    def __init__(self, *args, derivative_cache: DerivativeCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.derivative_cache = derivative_cache
+        self._locks: Dict[Path, asyncio.Lock] = {}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Staging files and other dot-entries are never public
+        if any(part.startswith(".") for part in Path(path).parts):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        storage = file_manager.storage
+        params = QueryParams(scope.get("query_string", b""))
+        if scope["method"] not in ("GET", "HEAD") or not any(name in params for name in DERIVATIVE_PARAMS):
+            if storage.is_local:
+                return await super().get_response(path, scope)
+            return await self._redirect_response(path, scope)
+
+        try:
+            width = self._dimension(params.get("w"))
+            height = self._dimension(params.get("h"))
+        except ValueError:
+            return PlainTextResponse(
+                f"w and h must be integers between 1 and {MAX_DERIVATIVE_DIMENSION}", status_code=400
+            )
+
+        if storage.is_local:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+            version = f"{stat_result.st_mtime_ns}:{stat_result.st_size}" if stat_result else None
+        else:
+            full_path = path
+            stored = await storage.stat(path)
+            version = f"{stored[1]}:{stored[0]}" if stored else None
+        if version is None or Path(path).suffix.lower() not in DERIVATIVE_SOURCE_SUFFIXES:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        fmt = (params.get("fmt") or self._source_format(path)).lower()
+        if fmt not in VARIANT_ENCODERS:
+            return PlainTextResponse(f"fmt must be one of: {', '.join(VARIANT_ENCODERS)}", status_code=400)
+        _, extension, mime_type, _ = VARIANT_ENCODERS[fmt]
+
+        # The source version (mtime or ETag) and size are part of the key so
+        # a replaced upload never serves an old derivative
+        key = hashlib.sha256(
+            f"{full_path}:{version}:{width}:{height}:{fmt}".encode()
+        ).hexdigest()
+        target = self.derivative_cache.path_for(key, extension)
+        if not self.derivative_cache.loaded:
+            await anyio.to_thread.run_sync(self.derivative_cache.load)
+
+        if not self.derivative_cache.get(target):
+            lock = self._locks.setdefault(target, asyncio.Lock())
+            try:
+                async with lock:
+                    if not self.derivative_cache.get(target):
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        await self._render(path, full_path, target, width, height, fmt)
+                        self.derivative_cache.add(target)
+            finally:
+                if not lock.locked():
+                    self._locks.pop(target, None)
+
+        response = FileResponse(target, media_type=mime_type)
+        response.headers["Cache-Control"] = self._cache_control(path)
+        return response
+
+    async def _render(self, path: str, full_path: str, target: Path, width, height, fmt: str):
+        storage = file_manager.storage
+        # Remote sources are downloaded next to the upload staging files
+        scratch = file_manager.upload_dir / INCOMING_DIR / f"{target.stem}{Path(path).suffix}"
+        try:
+            source = full_path if storage.is_local else str(await storage.fetch(path, scratch))
+            await file_manager.run_image_job(
+                render_derivative, source, str(target), width, height, fmt, queue="derivatives"
+            )
+        finally:
+            if not storage.is_local:
+                scratch.unlink(missing_ok=True)
+
+    async def _redirect_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        storage = file_manager.storage
+        if await storage.stat(path) is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return RedirectResponse(
+            await storage.signed_url(path),
+            status_code=307,
+            headers={"Cache-Control": storage.redirect_cache_control}
+        )
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        path = str(full_path)
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+        cache_control = self._cache_control(os.path.basename(path))
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200:
+            ranged = self._range_response(path, stat_result, request_headers, range_header, cache_control)
+            if ranged is not None:
+                return ranged
+
+        response = None
+        if media_type in COMPRESSIBLE_TYPES and not range_header:
+            response = self._precompressed_response(path, media_type, request_headers)
+        if response is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+
+        response.headers["Cache-Control"] = cache_control
+        response.headers["Accept-Ranges"] = "bytes"
+        if media_type in COMPRESSIBLE_TYPES:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _range_response(self, path, stat_result, request_headers, range_header, cache_control) -> Optional[Response]:
+        # Reuse FileResponse for the validators (ETag, Last-Modified, type)
+        base = FileResponse(path, stat_result=stat_result)
+        if_range = request_headers.get("if-range")
+        if if_range and if_range not in (base.headers["etag"], base.headers["last-modified"]):
+            return None
+
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return PlainTextResponse(
+                "Range Not Satisfiable", status_code=416, headers={"Content-Range": f"bytes */{size}"}
+            )
+        if byte_range is None:
+            return None
+
+        start, end = byte_range
+        headers = {
+            "content-type": base.headers["content-type"],
+            "etag": base.headers["etag"],
+            "last-modified": base.headers["last-modified"],
+            "content-range": f"bytes {start}-{end}/{size}",
+            "content-length": str(end - start + 1),
+            "accept-ranges": "bytes",
+            "cache-control": cache_control,
+        }
+        return FileRangeResponse(path, start, end, headers)
+
+    def _precompressed_response(self, path: str, media_type: str, request_headers: Headers) -> Optional[Response]:
+        qualities = accepted_encodings(request_headers.get("accept-encoding"))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if not accepts(qualities, encoding):
+                continue
+            sibling = f"{path}.{suffix}"
+            try:
+                sibling_stat = os.stat(sibling)
+            except OSError:
+                continue
+            response = FileResponse(sibling, stat_result=sibling_stat, media_type=media_type)
+            response.headers["Content-Encoding"] = encoding
+            # Keep encoded and identity representations apart for caches
+            response.headers["ETag"] = response.headers["etag"][:-1] + f'-{suffix}"'
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+    @staticmethod
+    def _cache_control(name: str) -> str:
+        return IMMUTABLE_CACHE_CONTROL if IMMUTABLE_NAME.match(os.path.basename(name)) else FILES_CACHE_CONTROL
+
+    @staticmethod
+    def _dimension(value: Optional[str]) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        number = int(value)
+        if not 1 <= number <= MAX_DERIVATIVE_DIMENSION:
+            raise ValueError(value)
+        return next((size for size in DERIVATIVE_SIZES if size >= number), DERIVATIVE_SIZES[-1])
+
+    @staticmethod
+    def _source_format(full_path: str) -> str:
+        suffix = Path(full_path).suffix.lower().lstrip(".")
+        return "jpeg" if suffix == "jpg" else suffix
@@ -0,0 +1,225 @@
+import os
+import asyncio
+import mimetypes
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:  # optional; only needed with STORAGE_BACKEND=s3
+    boto3 = None
+
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Stored keys are content addressed or uuid named and never change content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_headers(key: str) -> Tuple[str, Optional[str]]:
+    """Content type and encoding of a stored key (`x.pdf.br` is a br-encoded PDF)."""
+    content_type, encoding = mimetypes.guess_type(key)
+    return content_type or "application/octet-stream", encoding
+
+
+class LocalStorage:
+    """Uploads kept on the local disk, served directly by /api/files."""
+
+    is_local = True
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Key outside of storage: {key}")
+        return path
+
+    async def store(self, key: str, source: Path, cache_control: Optional[str] = None):
+        """Move a local file into storage under `key`."""
+        target = self.path(key)
+        if source.resolve() != target:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+
+    async def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    async def stat(self, key: str) -> Optional[Tuple[int, str]]:
+        """Size and a version tag of a key, or None when it is missing."""
+        try:
+            stat_result = self.path(key).stat()
+        except OSError:
+            return None
+        return stat_result.st_size, str(stat_result.st_mtime_ns)
+
+    async def list(self, directory: str, name_prefix: str = "") -> List[str]:
+        """Keys directly inside `directory` whose name starts with `name_prefix`."""
+        base = self.path(directory) if directory else self.root
+        if not base.is_dir():
+            return []
+        return [
+            (Path(directory) / entry.name).as_posix() if directory else entry.name
+            for entry in base.iterdir()
+            if entry.is_file() and entry.name.startswith(name_prefix)
+        ]
+
+    async def walk(self) -> List[str]:
+        """Every key in storage."""
+        return await asyncio.to_thread(
+            lambda: [
+                path.relative_to(self.root).as_posix()
+                for path in self.root.rglob("*") if path.is_file()
+            ]
+        )
+
+    async def delete(self, keys: List[str]):
+        for key in keys:
+            self.path(key).unlink(missing_ok=True)
+
+    async def fetch(self, key: str, target: Path) -> Path:
+        """Local path holding the key's bytes; files on disk are used in place."""
+        return self.path(key)
+
+
+class S3Storage:
+    """Uploads kept in an S3-compatible bucket and served via presigned URLs."""
+
+    is_local = False
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        public_endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        url_expires: int = 3600,
+        multipart_chunk_size: int = MULTIPART_CHUNK_SIZE
+    ):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.url_expires = url_expires
+        # Path-style addressing works with MinIO and other S3 stand-ins
+        config = Config(signature_version="s3v4", s3={"addressing_style": "path" if endpoint_url else "auto"})
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region, config=config)
+        self.signing_client = self.client
+        if public_endpoint_url:
+            self.signing_client = boto3.client(
+                "s3", endpoint_url=public_endpoint_url, region_name=region, config=config
+            )
+        # Files above the threshold go up as a multipart upload, streamed from
+        # disk one chunk at a time
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunk_size,
+            multipart_chunksize=multipart_chunk_size
+        )
+
+    @property
+    def redirect_cache_control(self) -> str:
+        # Browsers may reuse a redirect while its signature is still valid
+        return f"private, max-age={self.url_expires // 2}"
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def store(self, key: str, source: Path, cache_control: Optional[str] = None):
+        """Upload a local file under `key`, then remove the local copy."""
+        content_type, encoding = content_headers(key)
+        extra_args = {"ContentType": content_type}
+        if encoding:
+            extra_args["ContentEncoding"] = encoding
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        await asyncio.to_thread(
+            self.client.upload_file,
+            str(source), self.bucket, self._object_key(key),
+            ExtraArgs=extra_args, Config=self.transfer_config
+        )
+        source.unlink(missing_ok=True)
+
+    async def exists(self, key: str) -> bool:
+        return await self.stat(key) is not None
+
+    async def stat(self, key: str) -> Optional[Tuple[int, str]]:
+        """Size and a version tag of a key, or None when it is missing."""
+        try:
+            head = await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ContentLength"], head["ETag"].strip('"')
+
+    def _list_keys(self, prefix: str, delimiter: Optional[str]) -> List[str]:
+        params = {"Bucket": self.bucket, "Prefix": self._object_key(prefix)}
+        if delimiter:
+            params["Delimiter"] = delimiter
+        keys = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(**params):
+            keys.extend(item["Key"][len(self.prefix):] for item in page.get("Contents", []))
+        return keys
+
+    async def list(self, directory: str, name_prefix: str = "") -> List[str]:
+        """Keys directly inside `directory` whose name starts with `name_prefix`."""
+        prefix = f"{directory.strip('/')}/{name_prefix}" if directory.strip("/") else name_prefix
+        return await asyncio.to_thread(self._list_keys, prefix, "/")
+
+    async def walk(self) -> List[str]:
+        """Every key in storage."""
+        return await asyncio.to_thread(self._list_keys, "", None)
+
+    async def delete(self, keys: List[str]):
+        # DeleteObjects accepts at most 1000 keys per request
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            await asyncio.to_thread(
+                self.client.delete_objects,
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": self._object_key(key)} for key in batch], "Quiet": True}
+            )
+
+    async def fetch(self, key: str, target: Path) -> Path:
+        """Download a key to `target` and return it."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self.client.download_file, self.bucket, self._object_key(key), str(target))
+        return target
+
+    async def signed_url(self, key: str) -> str:
+        return await asyncio.to_thread(
+            self.signing_client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=self.url_expires
+        )
+
+
+def create_storage(root: Path):
+    """Storage backend configured by the environment.
+
+    STORAGE_BACKEND=local (default) keeps uploads under `root`; "s3" puts
+    them in S3_BUCKET, shared by every API replica. S3_ENDPOINT_URL points
+    the client at an S3-compatible server such as MinIO, and presigned URLs
+    are signed for S3_PUBLIC_ENDPOINT_URL when browsers reach it elsewhere.
+    """
+    backend = os.getenv("STORAGE_BACKEND", "local").lower()
+    if backend == "local":
+        return LocalStorage(root)
+    if backend == "s3":
+        return S3Storage(
+            bucket=os.environ["S3_BUCKET"],
+            prefix=os.getenv("S3_PREFIX", ""),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+            public_endpoint_url=os.getenv("S3_PUBLIC_ENDPOINT_URL") or None,
+            region=os.getenv("S3_REGION") or None,
+            url_expires=int(os.getenv("S3_URL_EXPIRES", "3600")),
+            multipart_chunk_size=int(os.getenv("S3_MULTIPART_CHUNK_SIZE", str(MULTIPART_CHUNK_SIZE)))
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the public portfolio endpoints.
+
+Compares, per request, the CPU spent turning loaded models into a JSON body:
+- jsonable_encoder: the previous render_section (jsonable_encoder + json.dumps)
+- response_model: FastAPI validating and encoding the returned models
+- render_section: the current path (pydantic-core JSON, ETag, Last-Modified)
+- cached: a section served from the cache (conditional_response only)
+
+Usage: python backend_benchmark.py [--items 50] [--rounds 200]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+import http_cache  # noqa: E402
+from models import BlogArticlePage, BlogArticleSummary, Project  # noqa: E402
+from server import app  # noqa: E402
+
+
+def sample_projects(count):
+    return [
+        Project(
+            title=f"Project {i}",
+            description="Full-stack application with a modern UI " * 2,
+            long_description="A longer write-up of the project, its stack and its results. " * 8,
+            technologies=["React", "FastAPI", "MongoDB", "Docker", "AWS"],
+            github_url=f"https://github.com/example/project-{i}",
+            live_url=f"https://project-{i}.example.com",
+            featured=i % 3 == 0,
+            category="Web Application",
+            order=i
+        )
+        for i in range(count)
+    ]
+
+
+def sample_blog_page(count):
+    now = datetime.utcnow()
+    articles = [
+        BlogArticleSummary(
+            title=f"Article {i}",
+            excerpt="What we learned shipping this feature. " * 3,
+            tags=["python", "performance", "web"],
+            publish_date=now - timedelta(days=i),
+            read_time="6 min read"
+        )
+        for i in range(count)
+    ]
+    return BlogArticlePage(items=articles, next_cursor="bmV4dA")
+
+
+def route_field(path):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.response_field
+    raise LookupError(path)
+
+
+def request_for(path):
+    return Request({"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""})
+
+
+def cpu_per_call(func, rounds):
+    start = time.process_time()
+    for _ in range(rounds):
+        func()
+    return (time.process_time() - start) / rounds
+
+
+def benchmark(path, data, rounds):
+    field = route_field(path)
+    loop = asyncio.new_event_loop()
+
+    def jsonable_encoder_path():
+        json.dumps(jsonable_encoder(data), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def response_model_path():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=data))
+        JSONResponse(content).body
+
+    def fast_path():
+        http_cache.render_section(data)
+
+    rendered = http_cache.render_section(data)
+    request = request_for(path)
+
+    def cached_path():
+        http_cache.conditional_response(request, rendered, "no-cache")
+
+    results = {
+        "jsonable_encoder": cpu_per_call(jsonable_encoder_path, rounds),
+        "response_model": cpu_per_call(response_model_path, rounds),
+        "render_section": cpu_per_call(fast_path, rounds),
+        "cached": cpu_per_call(cached_path, rounds),
+    }
+    loop.close()
+
+    baseline = results["jsonable_encoder"]
+    print(f"\n{path} ({len(rendered.body) / 1024:.1f} KiB body)")
+    for name, seconds in results.items():
+        print(f"  {name:<17} {seconds * 1000:8.3f} ms/request  {baseline / seconds:6.1f}x")
+    for name in ("jsonable_encoder", "response_model"):
+        saved = (results[name] - results["render_section"]) * 1000
+        print(f"  render_section saves {saved:.3f} ms CPU per uncached request over {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--items", type=int, default=50, help="Projects / blog articles per response")
+    parser.add_argument("--rounds", type=int, default=200, help="Requests timed per path")
+    args = parser.parse_args()
+
+    print(f"🚀 Serialization benchmark ({args.items} items, {args.rounds} rounds)")
+    benchmark("/api/portfolio/projects", sample_projects(args.items), args.rounds)
+    benchmark("/api/portfolio/blog", sample_blog_page(min(args.items, 100)), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -95,6 +95,17 @@ class PortfolioAPITester:
                     else:
                         self.log_test("Authentication - Get Current User", False, 
                                     f"Status: {me_response.status_code}", me_response.text)
+                    
+                    # Test /auth/refresh endpoint (rotates the refresh token)
+                    refresh_response = self.session.post(f"{self.base_url}/auth/refresh",
+                                                         json={"refresh_token": data.get("refresh_token")})
+                    if refresh_response.status_code == 200 and "access_token" in refresh_response.json():
+                        self.auth_token = refresh_response.json()["access_token"]
+                        self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+                        self.log_test("Authentication - Refresh Token", True, "Access token renewed")
+                    else:
+                        self.log_test("Authentication - Refresh Token", False, 
+                                    f"Status: {refresh_response.status_code}", refresh_response.text)
                 else:
                     self.log_test("Authentication - Login", False, "No access token in response", data)
             else:
@@ -106,16 +117,20 @@ class PortfolioAPITester:
     def test_public_endpoints(self):
         """Test all public portfolio endpoints"""
         public_endpoints = [
+            ("Portfolio Snapshot", "/portfolio"),
             ("Hero Section", "/portfolio/hero"),
             ("About Section", "/portfolio/about"),
             ("Education", "/portfolio/education"),
             ("Experience", "/portfolio/experience"),
             ("Skills", "/portfolio/skills"),
             ("Projects", "/portfolio/projects"),
+            ("Featured Projects", "/portfolio/projects?featured=true&limit=3"),
+            ("Project Categories", "/portfolio/projects/categories"),
             ("Certifications", "/portfolio/certifications"),
             ("Testimonials", "/portfolio/testimonials"),
             ("Blog Articles", "/portfolio/blog"),
-            ("Site Settings", "/portfolio/settings")
+            ("Site Settings", "/portfolio/settings"),
+            ("Search", "/portfolio/search?q=react")
         ]
         
         for name, endpoint in public_endpoints:
@@ -133,6 +148,23 @@ class PortfolioAPITester:
             except Exception as e:
                 self.log_test(f"Public - {name}", False, f"Exception: {str(e)}")
     
+    def test_conditional_get(self):
+        """Test ETag revalidation on public endpoints"""
+        try:
+            response = self.session.get(f"{self.base_url}/portfolio/hero")
+            etag = response.headers.get("ETag")
+            if response.status_code != 200 or not etag:
+                self.log_test("Conditional GET", False, f"Status: {response.status_code}, ETag: {etag}")
+                return
+            
+            revalidate = self.session.get(f"{self.base_url}/portfolio/hero", headers={"If-None-Match": etag})
+            if revalidate.status_code == 304 and not revalidate.content:
+                self.log_test("Conditional GET", True, f"304 for ETag {etag}")
+            else:
+                self.log_test("Conditional GET", False, f"Expected 304, got {revalidate.status_code}")
+        except Exception as e:
+            self.log_test("Conditional GET", False, f"Exception: {str(e)}")
+    
     def test_contact_form(self):
         """Test contact form submission"""
         try:
@@ -427,6 +459,20 @@ class PortfolioAPITester:
                     self.log_test("Admin - Projects Update", False, 
                                 f"Status: {update_response.status_code}", update_response.text)
                 
+                # BATCH + ORDER
+                batch_response = self.session.post(f"{self.base_url}/admin/projects/batch", json={
+                    "operations": [{"op": "update", "id": project_id, "data": {"featured": True}}]
+                })
+                order_response = self.session.put(f"{self.base_url}/admin/projects/order",
+                                                json={"ids": [project_id]})
+                if (batch_response.status_code == 200 and batch_response.json().get("updated") == 1
+                        and order_response.status_code == 200):
+                    self.log_test("Admin - Projects Batch/Order", True, "Batch update and reorder applied")
+                else:
+                    self.log_test("Admin - Projects Batch/Order", False, 
+                                f"Status: {batch_response.status_code}/{order_response.status_code}",
+                                batch_response.text)
+                
                 # DELETE
                 delete_response = self.session.delete(f"{self.base_url}/admin/projects/{project_id}")
                 if delete_response.status_code == 200:
@@ -637,12 +683,20 @@ class PortfolioAPITester:
             response = self.session.get(f"{self.base_url}/admin/contact-messages")
             if response.status_code == 200:
                 data = response.json()
-                if isinstance(data, list):
-                    self.log_test("Admin - Contact Messages", True, f"Retrieved {len(data)} contact messages")
+                if isinstance(data.get("items"), list):
+                    self.log_test("Admin - Contact Messages", True, f"Retrieved {len(data['items'])} contact messages")
                 else:
-                    self.log_test("Admin - Contact Messages", False, f"Expected list, got: {type(data)}")
+                    self.log_test("Admin - Contact Messages", False, f"Expected page, got: {type(data)}")
             else:
                 self.log_test("Admin - Contact Messages", False, f"Status: {response.status_code}", response.text)
+            
+            response = self.session.get(f"{self.base_url}/admin/contact-messages/count")
+            if response.status_code == 200 and "unread" in response.json():
+                counts = response.json()
+                self.log_test("Admin - Contact Message Counts", True, 
+                            f"Total: {counts['total']}, unread: {counts['unread']}")
+            else:
+                self.log_test("Admin - Contact Message Counts", False, f"Status: {response.status_code}", response.text)
         except Exception as e:
             self.log_test("Admin - Contact Messages", False, f"Exception: {str(e)}")
     
@@ -657,10 +711,10 @@ class PortfolioAPITester:
             response = self.session.get(f"{self.base_url}/admin/files")
             if response.status_code == 200:
                 data = response.json()
-                if isinstance(data, list):
-                    self.log_test("Admin - List Files", True, f"Retrieved {len(data)} files")
+                if isinstance(data, dict) and isinstance(data.get("items"), list):
+                    self.log_test("Admin - List Files", True, f"Retrieved {len(data['items'])} files")
                 else:
-                    self.log_test("Admin - List Files", False, f"Expected list, got: {type(data)}")
+                    self.log_test("Admin - List Files", False, f"Expected page, got: {type(data)}")
             else:
                 self.log_test("Admin - List Files", False, f"Status: {response.status_code}", response.text)
                 
@@ -681,6 +735,7 @@ class PortfolioAPITester:
         
         # Public endpoints
         self.test_public_endpoints()
+        self.test_conditional_get()
         self.test_contact_form()
         
         # Auth protection
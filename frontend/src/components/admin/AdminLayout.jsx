@@ -41,8 +41,8 @@ const AdminLayout = () => {
     { path: '/admin/messages', icon: Mail, label: 'Messages' },
   ];
 
-  const handleLogout = () => {
-    logout();
+  const handleLogout = async () => {
+    await logout();
     navigate('/admin/login');
   };
 
@@ -36,8 +36,16 @@ const BlogManager = () => {
 
   const fetchArticles = async () => {
     try {
-      const response = await portfolioAPI.getBlog();
-      setArticles(response.data);
+      // The list endpoint is paginated; walk every page for the admin view
+      const allArticles = [];
+      let cursor = null;
+      do {
+        const params = cursor ? { limit: 100, cursor } : { limit: 100 };
+        const response = await portfolioAPI.getBlog(params);
+        allArticles.push(...response.data.items);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setArticles(allArticles);
     } catch (error) {
       toast({
         title: "Error loading articles",
@@ -134,7 +142,20 @@ const BlogManager = () => {
     }
   };
 
-  const handleEdit = (item) => {
+  const handleEdit = async (summary) => {
+    // List items omit the article body, so load the full article first
+    let item = summary;
+    try {
+      const response = await portfolioAPI.getBlogArticle(summary.id);
+      item = response.data;
+    } catch (error) {
+      toast({
+        title: "Error loading article",
+        description: "Failed to fetch the full article",
+        variant: "destructive"
+      });
+      return;
+    }
     setEditingItem(item);
     setFormData({
       title: item.title,
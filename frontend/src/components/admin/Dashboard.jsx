@@ -61,7 +61,7 @@ const Dashboard = () => {
     },
     {
       title: 'Blog Articles',
-      value: data.blog?.length || 0,
+      value: data.blogCount || 0,
       icon: FileText,
       path: '/admin/blog'
     }
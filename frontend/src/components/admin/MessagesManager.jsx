@@ -7,7 +7,10 @@ import { Mail, Calendar, User, MessageSquare, Loader2 } from 'lucide-react';
 
 const MessagesManager = () => {
   const [messages, setMessages] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { toast } = useToast();
 
   useEffect(() => {
@@ -16,8 +19,13 @@ const MessagesManager = () => {
 
   const fetchMessages = async () => {
     try {
-      const response = await adminAPI.getContactMessages();
-      setMessages(response.data);
+      const [pageRes, countRes] = await Promise.all([
+        adminAPI.getContactMessages(),
+        adminAPI.countContactMessages()
+      ]);
+      setMessages(pageRes.data.items);
+      setNextCursor(pageRes.data.next_cursor);
+      setTotal(countRes.data.total);
     } catch (error) {
       toast({
         title: "Error loading messages",
@@ -29,6 +37,23 @@ const MessagesManager = () => {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await adminAPI.getContactMessages({ cursor: nextCursor });
+      setMessages(prev => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast({
+        title: "Error loading messages",
+        description: "Failed to fetch more contact messages",
+        variant: "destructive"
+      });
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -52,7 +77,7 @@ const MessagesManager = () => {
       <div className="flex items-center justify-between">
         <h1 className="text-3xl font-light text-black">Contact Messages</h1>
         <Badge variant="secondary" className="text-lg px-4 py-2">
-          {messages.length} {messages.length === 1 ? 'Message' : 'Messages'}
+          {total} {total === 1 ? 'Message' : 'Messages'}
         </Badge>
       </div>
 
@@ -64,9 +89,7 @@ const MessagesManager = () => {
         </Card>
       ) : (
         <div className="grid gap-6">
-          {messages
-            .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-            .map((message) => (
+          {messages.map((message) => (
               <Card key={message.id} className="p-6 hover:shadow-lg transition-shadow duration-200">
                 <div className="flex items-start justify-between mb-4">
                   <div className="flex items-center space-x-4">
@@ -118,6 +141,17 @@ const MessagesManager = () => {
                 </div>
               </Card>
             ))}
+          {nextCursor && (
+            <div className="flex justify-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="px-6 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 transition-colors duration-200"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
-import { authAPI, setToken, removeToken, getToken } from '../services/api';
+import { authAPI, setToken, setRefreshToken, removeToken, getToken } from '../services/api';
 
 const AuthContext = createContext();
 
@@ -41,9 +41,10 @@ export const AuthProvider = ({ children }) => {
   const login = async (email, password) => {
     try {
       const response = await authAPI.login(email, password);
-      const { access_token, user: userData } = response.data;
+      const { access_token, refresh_token, user: userData } = response.data;
       
       setToken(access_token);
+      setRefreshToken(refresh_token);
       setUser(userData);
       setIsAuthenticated(true);
       
@@ -57,7 +58,13 @@ export const AuthProvider = ({ children }) => {
     }
   };
 
-  const logout = () => {
+  const logout = async () => {
+    try {
+      // Revoke the session server-side so its tokens stop working
+      await authAPI.logout();
+    } catch (error) {
+      console.error('Logout failed:', error);
+    }
     removeToken();
     setUser(null);
     setIsAuthenticated(false);
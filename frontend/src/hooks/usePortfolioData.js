@@ -12,6 +12,8 @@ export const usePortfolioData = () => {
     certifications: [],
     testimonials: [],
     blog: [],
+    blogNextCursor: null,
+    blogCount: 0,
     settings: null
   });
   const [loading, setLoading] = useState(true);
@@ -22,41 +24,24 @@ export const usePortfolioData = () => {
       setLoading(true);
       setError(null);
 
-      const [
-        heroRes,
-        aboutRes,
-        educationRes,
-        experienceRes,
-        skillsRes,
-        projectsRes,
-        certificationsRes,
-        testimonialsRes,
-        blogRes,
-        settingsRes
-      ] = await Promise.all([
-        portfolioAPI.getHero(),
-        portfolioAPI.getAbout(),
-        portfolioAPI.getEducation(),
-        portfolioAPI.getExperience(),
-        portfolioAPI.getSkills(),
-        portfolioAPI.getProjects(),
-        portfolioAPI.getCertifications(),
-        portfolioAPI.getTestimonials(),
-        portfolioAPI.getBlog(),
-        portfolioAPI.getSettings()
-      ]);
+      // Single round trip: the backend serves a precomputed snapshot
+      const response = await portfolioAPI.getPortfolio();
+      const portfolio = response.data;
 
       setData({
-        hero: heroRes.data,
-        about: aboutRes.data,
-        education: educationRes.data,
-        experience: experienceRes.data,
-        skills: skillsRes.data,
-        projects: projectsRes.data,
-        certifications: certificationsRes.data,
-        testimonials: testimonialsRes.data,
-        blog: blogRes.data,
-        settings: settingsRes.data
+        hero: portfolio.hero,
+        about: portfolio.about,
+        education: portfolio.education,
+        experience: portfolio.experience,
+        skills: portfolio.skills,
+        projects: portfolio.projects,
+        certifications: portfolio.certifications,
+        testimonials: portfolio.testimonials,
+        // Only the first page of articles; blogCount counts all of them
+        blog: portfolio.blog,
+        blogNextCursor: portfolio.blog_next_cursor,
+        blogCount: portfolio.blog_count,
+        settings: portfolio.settings
       });
     } catch (err) {
       console.error('Error fetching portfolio data:', err);
@@ -13,6 +13,7 @@ const api = axios.create({
 
 // Token management
 const TOKEN_KEY = 'portfolio_token';
+const REFRESH_TOKEN_KEY = 'portfolio_refresh_token';
 
 export const getToken = () => {
   return localStorage.getItem(TOKEN_KEY);
@@ -23,8 +24,17 @@ export const setToken = (token) => {
   api.defaults.headers.common['Authorization'] = `Bearer ${token}`;
 };
 
+export const getRefreshToken = () => {
+  return localStorage.getItem(REFRESH_TOKEN_KEY);
+};
+
+export const setRefreshToken = (refreshToken) => {
+  localStorage.setItem(REFRESH_TOKEN_KEY, refreshToken);
+};
+
 export const removeToken = () => {
   localStorage.removeItem(TOKEN_KEY);
+  localStorage.removeItem(REFRESH_TOKEN_KEY);
   delete api.defaults.headers.common['Authorization'];
 };
 
@@ -38,21 +48,27 @@ if (token) {
 export const authAPI = {
   login: (email, password) => api.post('/auth/login', { email, password }),
   logout: () => api.post('/auth/logout'),
+  refresh: (refreshToken) => api.post('/auth/refresh', { refresh_token: refreshToken }),
   getCurrentUser: () => api.get('/auth/me'),
 };
 
 // Public Portfolio API
 export const portfolioAPI = {
+  getPortfolio: () => api.get('/portfolio'),
   getHero: () => api.get('/portfolio/hero'),
   getAbout: () => api.get('/portfolio/about'),
   getEducation: () => api.get('/portfolio/education'),
   getExperience: () => api.get('/portfolio/experience'),
   getSkills: () => api.get('/portfolio/skills'),
-  getProjects: () => api.get('/portfolio/projects'),
+  // params: { category, featured, technology, limit }
+  getProjects: (params = {}) => api.get('/portfolio/projects', { params }),
+  getProjectCategories: () => api.get('/portfolio/projects/categories'),
   getCertifications: () => api.get('/portfolio/certifications'),
   getTestimonials: () => api.get('/portfolio/testimonials'),
-  getBlog: () => api.get('/portfolio/blog'),
+  getBlog: (params = {}) => api.get('/portfolio/blog', { params }),
+  getBlogArticle: (id) => api.get(`/portfolio/blog/${id}`),
   getSettings: () => api.get('/portfolio/settings'),
+  search: (q, params = {}) => api.get('/portfolio/search', { params: { q, ...params } }),
   submitContact: (data) => api.post('/contact', data),
 };
 
@@ -64,6 +80,11 @@ export const adminAPI = {
   // About section
   updateAbout: (data) => api.put('/admin/about', data),
   
+  // Bulk edits of a list collection (education, experience, projects,
+  // certifications, testimonials, blog)
+  batch: (collection, operations) => api.post(`/admin/${collection}/batch`, { operations }),
+  reorder: (collection, ids) => api.put(`/admin/${collection}/order`, { ids }),
+  
   // Education
   createEducation: (data) => api.post('/admin/education', data),
   updateEducation: (id, data) => api.put(`/admin/education/${id}`, data),
@@ -114,10 +135,8 @@ export const adminAPI = {
     });
   },
   
-  listFiles: (subfolder = null) => {
-    const params = subfolder ? { subfolder } : {};
-    return api.get('/admin/files', { params });
-  },
+  // params: { subfolder, type, limit, cursor }
+  listFiles: (params = {}) => api.get('/admin/files', { params }),
   
   deleteFile: (filename, subfolder = null) => {
     const params = subfolder ? { subfolder } : {};
@@ -125,14 +144,50 @@ export const adminAPI = {
   },
   
   // Contact messages
-  getContactMessages: () => api.get('/admin/contact-messages'),
+  getContactMessages: (params = {}) => api.get('/admin/contact-messages', { params }),
+  countContactMessages: () => api.get('/admin/contact-messages/count'),
+  markContactMessages: (ids, read = true) => api.post('/admin/contact-messages/mark-read', { ids, read }),
 };
 
 // Request interceptor for error handling
+// Access tokens are short-lived: on a 401, renew them with the refresh
+// token once and replay the request. Concurrent 401s share one refresh.
+let refreshPromise = null;
+
+const refreshAccessToken = () => {
+  if (!refreshPromise) {
+    // Tabs refreshing with the same token at once are all answered by the
+    // server within its reuse grace window
+    refreshPromise = authAPI.refresh(getRefreshToken())
+      .then(({ data }) => {
+        setToken(data.access_token);
+        setRefreshToken(data.refresh_token);
+        return data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
+  async (error) => {
+    const request = error.config;
+    const isAuthCall = ['/auth/login', '/auth/refresh', '/auth/logout'].includes(request?.url);
+    
+    if (error.response?.status === 401 && !isAuthCall) {
+      if (!request._retried && getRefreshToken()) {
+        request._retried = true;
+        try {
+          const accessToken = await refreshAccessToken();
+          request.headers['Authorization'] = `Bearer ${accessToken}`;
+          return api(request);
+        } catch (refreshError) {
+          // Fall through to a fresh login
+        }
+      }
       removeToken();
       window.location.href = '/admin/login';
     }
@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from database import Database
+
+GRACE = timedelta(seconds=30)
+
+
+@pytest.fixture
+def database():
+    database = Database("mongodb://localhost:27017", "auth_test")
+    database.db = AsyncMongoMockClient()["auth_test"]
+    return database
+
+
+def start_session(database, token_hash="old"):
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    return asyncio.run(database.create_session("user-1", token_hash, expires_at))
+
+
+def stored(database, session):
+    return asyncio.run(database.db.refresh_tokens.find_one({"id": session.id}))
+
+
+def test_rotate_replaces_the_token(database):
+    session = start_session(database)
+    rotated = asyncio.run(database.rotate_session("old", "t1", GRACE))
+    assert rotated.id == session.id and rotated.user_id == "user-1"
+    assert asyncio.run(database.rotate_session("t1", "t2", GRACE)).id == session.id
+    assert asyncio.run(database.rotate_session("unknown", "t3", GRACE)) is None
+    assert stored(database, session)["revoked_at"] is None
+
+
+def test_replay_inside_window_keeps_both_tokens_valid(database):
+    session = start_session(database)
+    assert asyncio.run(database.rotate_session("old", "t1", GRACE)).id == session.id
+    assert asyncio.run(database.rotate_session("old", "t2", GRACE)).id == session.id
+    assert stored(database, session)["revoked_at"] is None
+
+    # Either tab's token rotates; the other one is then superseded
+    assert asyncio.run(database.rotate_session("t1", "t3", GRACE)).id == session.id
+    assert asyncio.run(database.rotate_session("t2", "t4", GRACE)) is None
+    assert asyncio.run(database.rotate_session("t3", "t5", GRACE)).id == session.id
+    assert stored(database, session)["revoked_at"] is None
+
+
+def test_grace_token_rotates_too(database):
+    session = start_session(database)
+    asyncio.run(database.rotate_session("old", "t1", GRACE))
+    asyncio.run(database.rotate_session("old", "t2", GRACE))
+    assert asyncio.run(database.rotate_session("t2", "t3", GRACE)).id == session.id
+    assert asyncio.run(database.rotate_session("t1", "t4", GRACE)) is None
+    assert stored(database, session)["token_hash"] == "t3"
+
+
+def test_replay_after_window_revokes_the_session(database):
+    session = start_session(database)
+    asyncio.run(database.rotate_session("old", "t1", GRACE))
+    assert asyncio.run(database.rotate_session("old", "t2", timedelta(0))) is None
+    assert stored(database, session)["revoked_at"] is not None
+    assert asyncio.run(database.rotate_session("t1", "t3", GRACE)) is None
+
+
+def test_revoked_session_does_not_rotate(database):
+    session = start_session(database)
+    asyncio.run(database.rotate_session("old", "t1", GRACE))
+    assert asyncio.run(database.revoke_session(session.id))
+    assert asyncio.run(database.rotate_session("t1", "t2", GRACE)) is None
+    assert asyncio.run(database.rotate_session("old", "t3", GRACE)) is None
+    assert not asyncio.run(database.revoke_session(session.id))
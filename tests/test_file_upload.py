@@ -0,0 +1,128 @@
+import io
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+from mongomock_motor import AsyncMongoMockClient
+from PIL import Image
+from starlette.datastructures import Headers
+
+from file_upload import FileUploadManager
+from storage import LocalStorage
+
+
+def png_bytes(size=(1600, 800), color="red") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def upload_file(data: bytes, filename="photo.png", content_type="image/png") -> UploadFile:
+    return UploadFile(
+        io.BytesIO(data), size=len(data), filename=filename,
+        headers=Headers({"content-type": content_type})
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FileUploadManager(storage=LocalStorage(tmp_path))
+    manager.upload_dir = tmp_path
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["uploads_test"]
+
+
+def stored_key(manager, saved) -> str:
+    return manager.key_for(Path(saved["file_path"]))
+
+
+def stored_files(root):
+    return sorted(
+        path.relative_to(root).as_posix() for path in root.rglob("*")
+        if path.is_file() and ".incoming" not in path.parts
+    )
+
+
+def test_identical_uploads_share_one_blob(manager, db, tmp_path):
+    async def scenario():
+        data = png_bytes()
+        first = await manager.save_file(upload_file(data), None, db)
+        second = await manager.save_file(upload_file(data, filename="copy.png"), "gallery", db)
+        assert first["file_path"] == second["file_path"]
+        assert second["variants"] == first["variants"]
+        ref = await db.upload_refs.find_one({"_id": first["sha256"]})
+        assert ref["refs"] == 2 and ref["status"] == "ready"
+        assert await db.uploads.count_documents({}) == 2
+
+        assert await manager.delete_upload(first["filename"], None, db)
+        assert (tmp_path / stored_key(manager, first)).exists()
+        assert await manager.delete_upload(first["filename"], "gallery", db)
+        assert stored_files(tmp_path) == []
+        assert await db.upload_refs.count_documents({}) == 0
+
+    asyncio.run(scenario())
+
+
+def test_deleting_from_another_subfolder_keeps_the_blob(manager, db, tmp_path):
+    async def scenario():
+        saved = await manager.save_file(upload_file(png_bytes(color="yellow")), "gallery", db)
+        files = stored_files(tmp_path)
+
+        assert not await manager.delete_upload(saved["filename"], "nonexistent", db)
+        assert stored_files(tmp_path) == files
+        assert await db.uploads.count_documents({"subfolder": "gallery"}) == 1
+        assert (await db.upload_refs.find_one({"_id": saved["sha256"]}))["refs"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_identical_uploads_wait_for_processing(manager, db):
+    async def scenario():
+        data = png_bytes(color="green")
+        results = await asyncio.gather(*(manager.save_file(upload_file(data), None, db) for _ in range(3)))
+        assert {(r["width"], r["height"], len(r["variants"])) for r in results} == {
+            (results[0]["width"], results[0]["height"], len(results[0]["variants"]))
+        }
+        assert results[0]["width"] and results[0]["variants"]
+        ref = await db.upload_refs.find_one({})
+        assert ref["refs"] == 3 and ref["status"] == "ready"
+
+    asyncio.run(scenario())
+
+
+def test_reconciled_blob_can_be_deleted(manager, db, tmp_path):
+    async def scenario():
+        saved = await manager.save_file(upload_file(png_bytes(color="blue")), None, db)
+        await db.uploads.delete_many({})
+        await db.upload_refs.delete_many({})
+
+        report = await manager.reconcile(db)
+        assert report["added"] == [stored_key(manager, saved)]
+        record = await db.uploads.find_one({})
+        assert record["sha256"] == saved["sha256"]
+        assert await db.upload_refs.find_one({"_id": saved["sha256"]}) is not None
+
+        assert await manager.delete_upload(saved["filename"], None, db)
+        assert stored_files(tmp_path) == []
+        assert await db.upload_refs.count_documents({}) == 0
+
+    asyncio.run(scenario())
+
+
+def test_reconcile_drops_entries_of_missing_files(manager, db, tmp_path):
+    async def scenario():
+        saved = await manager.save_file(upload_file(b"%PDF-1.4 test", "cv.pdf", "application/pdf"), None, db)
+        (tmp_path / stored_key(manager, saved)).unlink()
+
+        report = await manager.reconcile(db)
+        assert report["removed"] and report["added"] == []
+        assert await db.uploads.count_documents({}) == 0
+        assert await db.upload_refs.count_documents({}) == 0
+
+    asyncio.run(scenario())